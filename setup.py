@@ -61,6 +61,7 @@ setup(
     ],
     extras_require={
         "dev": ["build>=1.0.3", "sphinx"],
+        "http2": ["httpx[http2]>=0.23.0"],
     },
     python_requires=">=3.8",
 )
@@ -1,3 +1,6 @@
 __version__ = "0.1.2"
 
 from .connector import InterClient
+from .reconciliacao import ConciliadorPix
+from .monitoramento import MonitorCobrancas
+from .webhooks import ReconciliadorWebhooks, WebhookDesejado
@@ -1,5 +1,8 @@
 import datetime
 import logging
+import os
+import threading
+import weakref
 from typing import Literal, Union
 
 import requests
@@ -15,10 +18,28 @@ from .error import (
     RateLimitError,
 )
 from .patch import HTTPAdapter, patch_requests
-from .utils import mask_sensitive_data
+from .utils import CacheTTL, mask_sensitive_data
 
 logger = logging.getLogger(__name__)
 
+# Instâncias vivas do cliente, usadas para descartar as conexões herdadas após um fork.
+_instancias = weakref.WeakSet()
+
+
+def _descartar_sessoes_herdadas():
+    # Após um fork (gunicorn pre-fork, multiprocessing, etc.) o processo filho herda
+    # os sockets do pool do pai. Eles não podem ser compartilhados, então apenas
+    # soltamos a referência (sem fechar, para não derrubar a conexão do pai) e a
+    # sessão é recriada sob demanda no filho.
+    for instancia in list(_instancias):
+        instancia._session = None
+        instancia._pid = os.getpid()
+        instancia._lock_sessao = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_descartar_sessoes_herdadas)
+
 
 class API(object):
     def __init__(
@@ -30,6 +51,10 @@ class API(object):
         base_url: Union[str, None] = None,
         scope: Union[str, None] = None,
         conta_corrente: Union[str, None] = None,
+        pool_maxsize: int = 10,
+        http2: bool = False,
+        transporte=None,
+        ttl_cache_saldo: float = 0,
     ):
         self.base_url = base_url or "https://cdpj.partners.bancointer.com.br/"
         self.client_id = client_id
@@ -37,10 +62,75 @@ class API(object):
         self.scope = scope
         self.access_token = None
         self.access_token_expiration = None
-        patch_requests(adapter=False)
-        self.session = requests.Session()
-        self.session.mount("https://", HTTPAdapter())
-        self.session.headers.update({"Content-Type": "application/json;charset=utf-8"})
+        self.conta_corrente = conta_corrente
+        # Tamanho do pool de conexões, deve acompanhar o número de threads usadas nas
+        # operações em lote.
+        self.pool_maxsize = pool_maxsize
+        # Usa o transporte HTTP/2 (httpx), que multiplexa as requisições simultâneas em
+        # uma única conexão, em vez do requests.
+        self.http2 = http2
+        # Camadas opcionais entre o cliente e a sessão HTTP (por exemplo, a gravação e
+        # reprodução de cassetes ou o circuit breaker). Cada camada deve ter o método
+        # "envolver(session)", que recebe a sessão e retorna um objeto com a mesma
+        # interface. Em uma lista, a primeira camada é a mais próxima da rede.
+        self.transporte = transporte
+        # Saldos consultados ficam em cache por "ttl_cache_saldo" segundos (0 desativa).
+        self.cache_saldo = CacheTTL(ttl_cache_saldo)
+        self.__carregar_certificado(client_certificate, client_key)
+        self._session = None
+        self._pid = os.getpid()
+        self._lock_sessao = threading.Lock()
+        _instancias.add(self)
+        return
+
+    @property
+    def session(self) -> requests.Session:
+        # A sessão (e o pool de conexões) é criada sob demanda e pertence ao processo
+        # que a criou. Se o cliente foi herdado por um fork ou desserializado em outro
+        # processo, uma sessão nova é criada. O lock garante uma única sessão quando
+        # várias threads a usam pela primeira vez ao mesmo tempo.
+        session = self._session
+        if session is not None and self._pid == os.getpid():
+            return session
+        with self._lock_sessao:
+            if self._session is None or self._pid != os.getpid():
+                self._session = self.__criar_sessao()
+                self._pid = os.getpid()
+            return self._session
+
+    @session.setter
+    def session(self, session: requests.Session):
+        self._session = session
+        self._pid = os.getpid()
+
+    def __criar_sessao(self) -> requests.Session:
+        if self.http2:
+            from .http2 import HTTP2Session
+
+            session = HTTP2Session(self.cert)
+        else:
+            patch_requests(adapter=False)
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_maxsize=self.pool_maxsize))
+        camadas = self.transporte
+        if camadas is not None and not isinstance(camadas, (list, tuple)):
+            camadas = [camadas]
+        for camada in camadas or ():
+            session = camada.envolver(session)
+        session.headers.update({"Content-Type": "application/json;charset=utf-8"})
+        if self.conta_corrente:
+            session.headers.update({"x-conta-corrente": self.conta_corrente})
+        if self.access_token:
+            session.headers.update({"Authorization": f"Bearer {self.access_token}"})
+        return session
+
+    def __carregar_certificado(
+        self, client_certificate: Union[bytes, None], client_key: Union[bytes, None]
+    ):
+        # Os bytes originais são mantidos para permitir serializar o cliente, já que
+        # os objetos do cryptography não podem ser serializados com pickle.
+        self.__client_certificate = client_certificate
+        self.__client_key = client_key
         cert = (
             x509.load_pem_x509_certificate(client_certificate, default_backend())
             if client_certificate
@@ -48,14 +138,29 @@ class API(object):
         )
         key = (
             serialization.load_pem_private_key(client_key, None, default_backend())
-            if client_secret
+            if client_key
             else None
         )
         self.cert = (cert, key)
-        self.conta_corrente = conta_corrente
-        if conta_corrente:
-            self.session.headers.update({"x-conta-corrente": conta_corrente})
-        return
+
+    def __getstate__(self):
+        # Serializa apenas as credenciais e a configuração. A sessão HTTP e os objetos
+        # do certificado são recriados no processo que desserializar o cliente. As
+        # camadas de "transporte" descartam os próprios arquivos e locks ao serem
+        # serializadas e após um fork.
+        state = self.__dict__.copy()
+        state["_session"] = None
+        state["_pid"] = None
+        state.pop("cert", None)
+        state.pop("_lock_sessao", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__carregar_certificado(self.__client_certificate, self.__client_key)
+        self._pid = os.getpid()
+        self._lock_sessao = threading.Lock()
+        _instancias.add(self)
 
     @property
     def is_autenticated(self):
@@ -89,17 +194,7 @@ class API(object):
         self.client_id = client_id or self.client_id
         self.client_secret = client_secret or self.client_secret
         if client_certificate and client_key:
-            cert = (
-                x509.load_pem_x509_certificate(client_certificate, default_backend())
-                if client_certificate
-                else None
-            )
-            key = (
-                serialization.load_pem_private_key(client_key, None, default_backend())
-                if client_secret
-                else None
-            )
-            self.cert = (cert, key)
+            self.__carregar_certificado(client_certificate, client_key)
         self.scope = scope or self.scope
 
         oauth = self.__get_oauth_token()
@@ -0,0 +1,229 @@
+import decimal
+import re
+import unicodedata
+from typing import Iterable, Iterator, Union
+
+GUI_PIX = "br.gov.bcb.pix"
+
+# O txid do BR Code estático tem até 25 caracteres alfanuméricos.
+_TXID_VALIDO = re.compile(r"[A-Za-z0-9]{1,25}")
+
+
+def _gerar_tabela_crc16(polinomio: int = 0x1021):
+    tabela = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ polinomio) if crc & 0x8000 else (crc << 1)
+        tabela.append(crc & 0xFFFF)
+    return tuple(tabela)
+
+
+_TABELA_CRC16 = _gerar_tabela_crc16()
+
+
+def crc16(dados: Union[bytes, str], crc: int = 0xFFFF) -> int:
+    """
+    Calcula o CRC16-CCITT (polinômio 0x1021, valor inicial 0xFFFF) usado no BR Code,
+    com uma tabela pré-calculada de 256 posições.
+
+    O parâmetro `crc` permite continuar o cálculo a partir do CRC de um prefixo já
+    calculado.
+    """
+    if isinstance(dados, str):
+        dados = dados.encode("utf-8")
+    tabela = _TABELA_CRC16
+    for byte in dados:
+        crc = ((crc << 8) & 0xFF00) ^ tabela[(crc >> 8) ^ byte]
+    return crc
+
+
+def _campo(identificador: str, valor: str) -> str:
+    if len(valor) > 99:
+        raise ValueError(
+            f'O campo "{identificador}" do BR Code tem mais de 99 caracteres: {valor}'
+        )
+    return f"{identificador}{len(valor):02d}{valor}"
+
+
+def _normalizar_texto(texto: str, tamanho_maximo: int) -> str:
+    # O BR Code só aceita caracteres ASCII nos campos de nome e cidade.
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return texto.strip()[:tamanho_maximo]
+
+
+def _validar_txid(txid: Union[str, None]) -> str:
+    if txid is None or txid == "***":
+        return "***"
+    if not isinstance(txid, str) or not _TXID_VALIDO.fullmatch(txid):
+        raise ValueError(
+            'O "txid" do BR Code deve ter de 1 a 25 caracteres alfanuméricos, '
+            f"valor fornecido: {txid}"
+        )
+    return txid
+
+
+def _formatar_valor(valor: Union[decimal.Decimal, str, int, float]) -> str:
+    try:
+        valor = decimal.Decimal(str(valor))
+    except decimal.InvalidOperation:
+        raise ValueError(f"Valor inválido para o BR Code: {valor}")
+    if valor <= 0:
+        raise ValueError(f"Valor inválido para o BR Code: {valor}")
+    return "{:.2f}".format(valor)
+
+
+def _conta_merchant(
+    chave: Union[str, None],
+    location: Union[str, None],
+    info_adicional: Union[str, None],
+) -> str:
+    if bool(chave) == bool(location):
+        raise ValueError(
+            'É preciso fornecer a "chave" (BR Code estático) ou a "location" '
+            "(BR Code dinâmico), mas não ambos."
+        )
+    conteudo = _campo("00", GUI_PIX)
+    if chave:
+        conteudo += _campo("01", chave)
+        if info_adicional:
+            conteudo += _campo("02", _normalizar_texto(info_adicional, 99))
+    else:
+        # A URL do payload dinâmico é informada sem o protocolo.
+        location = location.split("://", 1)[-1]
+        conteudo += _campo("25", location)
+    return _campo("26", conteudo)
+
+
+def _sufixo(nome_recebedor: str, cidade: str) -> str:
+    return (
+        _campo("58", "BR")
+        + _campo("59", _normalizar_texto(nome_recebedor, 25))
+        + _campo("60", _normalizar_texto(cidade, 15))
+    )
+
+
+def _finalizar(payload: str) -> str:
+    payload += "6304"
+    return payload + "{:04X}".format(crc16(payload.encode("utf-8")))
+
+
+def gerar_brcode(
+    nome_recebedor: str,
+    cidade: str,
+    chave: Union[str, None] = None,
+    location: Union[str, None] = None,
+    valor: Union[decimal.Decimal, str, int, float, None] = None,
+    txid: Union[str, None] = None,
+    info_adicional: Union[str, None] = None,
+    unico: bool = False,
+) -> str:
+    """
+    Gera localmente o payload de um BR Code (PIX copia-e-cola), sem chamar a API.
+
+    Parâmetros:
+    - nome_recebedor (str): Nome do recebedor (até 25 caracteres).
+    - cidade (str): Cidade do recebedor (até 15 caracteres).
+    - chave (str | None): Chave PIX, para um BR Code estático.
+    - location (str | None): "location" retornada por `criar_cobranca_pix`, para um
+    BR Code dinâmico.
+    - valor (Decimal | str | int | float | None): Valor do PIX, opcional no estático.
+    - txid (str | None): Identificador da transação, usado apenas no BR Code estático.
+    - info_adicional (str | None): Informação adicional, usada apenas no BR Code
+    estático.
+    - unico (bool): Se o BR Code só pode ser pago uma vez. Os dinâmicos sempre são.
+
+    Retorna:
+    - str: O payload do BR Code, incluindo o CRC16.
+    """
+    payload = _campo("00", "01")
+    if location or unico:
+        payload += _campo("01", "12")
+    payload += _conta_merchant(chave, location, info_adicional)
+    payload += _campo("52", "0000") + _campo("53", "986")
+    if valor is not None:
+        payload += _campo("54", _formatar_valor(valor))
+    payload += _sufixo(nome_recebedor, cidade)
+    payload += _campo("62", _campo("05", "***" if location else _validar_txid(txid)))
+    return _finalizar(payload)
+
+
+def gerar_brcode_cobranca(cobranca: dict, nome_recebedor: str, cidade: str) -> str:
+    """
+    Gera o BR Code dinâmico de uma cobrança retornada por `criar_cobranca_pix`.
+    """
+    location = cobranca.get("location") if isinstance(cobranca, dict) else None
+    if not location:
+        raise ValueError('A cobrança deve ser um dict contendo a "location".')
+    return gerar_brcode(
+        nome_recebedor,
+        cidade,
+        location=location,
+        valor=cobranca.get("valor", {}).get("original"),
+    )
+
+
+def gerar_brcodes_cobrancas(
+    cobrancas: Iterable[dict], nome_recebedor: str, cidade: str
+) -> Iterator[str]:
+    """
+    Gera os BR Codes dinâmicos de várias cobranças, sem chamadas à API.
+
+    Os trechos que não mudam entre as cobranças (cabeçalho, dados do recebedor e
+    campo adicional) e o CRC do cabeçalho são calculados uma única vez.
+    """
+    prefixo = _campo("00", "01") + _campo("01", "12")
+    crc_prefixo = crc16(prefixo.encode("utf-8"))
+    meio = _campo("52", "0000") + _campo("53", "986")
+    sufixo = _sufixo(nome_recebedor, cidade) + _campo("62", _campo("05", "***"))
+    for cobranca in cobrancas:
+        location = cobranca.get("location") if isinstance(cobranca, dict) else None
+        if not location:
+            raise ValueError('A cobrança deve ser um dict contendo a "location".')
+        corpo = _conta_merchant(None, location, None) + meio
+        valor = cobranca.get("valor", {}).get("original")
+        if valor is not None:
+            corpo += _campo("54", _formatar_valor(valor))
+        corpo += sufixo + "6304"
+        crc = crc16(corpo.encode("utf-8"), crc_prefixo)
+        yield prefixo + corpo + "{:04X}".format(crc)
+
+
+def _ler_campos(payload: str) -> dict:
+    campos = {}
+    posicao = 0
+    while posicao < len(payload):
+        identificador = payload[posicao : posicao + 2]
+        tamanho = payload[posicao + 2 : posicao + 4]
+        if len(identificador) < 2 or not tamanho.isdigit():
+            raise ValueError(f"BR Code malformado na posição {posicao}.")
+        inicio = posicao + 4
+        fim = inicio + int(tamanho)
+        if fim > len(payload):
+            raise ValueError(f'O campo "{identificador}" do BR Code está truncado.')
+        campos[identificador] = payload[inicio:fim]
+        posicao = fim
+    return campos
+
+
+def ler_brcode(payload: str) -> dict:
+    """
+    Lê um payload de BR Code, validando o CRC16, e retorna os campos em um dict.
+
+    Os templates aninhados (26 a 51, conta do recebedor, e 62, dados adicionais) são
+    retornados como dicts.
+    """
+    payload = payload.strip()
+    if len(payload) < 8 or payload[-8:-4] != "6304":
+        raise ValueError("O BR Code não termina com o campo de CRC16.")
+    crc_esperado = "{:04X}".format(crc16(payload[:-4].encode("utf-8")))
+    if payload[-4:].upper() != crc_esperado:
+        raise ValueError(
+            f"CRC16 do BR Code inválido: {payload[-4:]}, esperado: {crc_esperado}"
+        )
+
+    campos = _ler_campos(payload)
+    for identificador, valor in campos.items():
+        if "26" <= identificador <= "51" or identificador == "62":
+            campos[identificador] = _ler_campos(valor)
+    return campos
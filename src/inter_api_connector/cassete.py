@@ -0,0 +1,400 @@
+import atexit
+import base64
+import glob
+import json
+import os
+import threading
+import time
+import weakref
+import zlib
+from collections import defaultdict, deque
+from typing import Dict, Union
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .error import CasseteError
+from .utils import mask_sensitive_data
+
+# Campos mascarados nos corpos das requisições e respostas gravadas.
+CAMPOS_SENSIVEIS = ("client_id", "client_secret", "access_token", "refresh_token")
+
+
+# Reprodutores vivos, cujos locks são recriados após um fork.
+_instancias = weakref.WeakSet()
+
+# Arquivos abertos para gravação neste processo, compartilhados pelos gravadores da
+# mesma cassete (inclusive cópias desserializadas).
+_fluxos: Dict[str, "_FluxoCassete"] = {}
+_lock_fluxos = threading.Lock()
+
+
+def _reiniciar_apos_fork():
+    global _lock_fluxos
+    _lock_fluxos = threading.Lock()
+    for fluxo in _fluxos.values():
+        fluxo.descartar()
+    _fluxos.clear()
+    for instancia in list(_instancias):
+        instancia._reiniciar_apos_fork()
+
+
+def _fechar_fluxos():
+    for fluxo in list(_fluxos.values()):
+        fluxo.fechar()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reiniciar_apos_fork)
+atexit.register(_fechar_fluxos)
+
+
+def _comprimida(caminho: str) -> bool:
+    # Cassetes terminadas em ".gz" são comprimidas.
+    return str(caminho).endswith(".gz")
+
+
+def _arquivos_cassete(caminho: str) -> list:
+    # A cassete principal e as gravadas por outros processos ("<caminho>.<pid>").
+    arquivos = [caminho] if os.path.exists(caminho) else []
+    arquivos += sorted(
+        arquivo
+        for arquivo in glob.glob(glob.escape(str(caminho)) + ".*")
+        if arquivo.rsplit(".", 1)[1].isdigit()
+    )
+    # Sem nenhum arquivo, a abertura da cassete principal levanta o erro.
+    return arquivos or [caminho]
+
+
+def _ler_linhas(caminho: str, comprimida: bool):
+    # Os membros gzip são descomprimidos em sequência. Um membro sem o final (de um
+    # processo encerrado sem `fechar`) é lido até o último registro completo.
+    with open(caminho, "rb") as arquivo:
+        descompressor = zlib.decompressobj(31) if comprimida else None
+        resto = b""
+        while True:
+            bloco = arquivo.read(64 * 1024)
+            if not bloco:
+                break
+            while descompressor is not None and bloco:
+                dados = descompressor.decompress(bloco)
+                bloco = b""
+                if descompressor.eof:
+                    bloco = descompressor.unused_data
+                    descompressor = zlib.decompressobj(31)
+                resto += dados
+            if descompressor is None:
+                resto += bloco
+            *linhas, resto = resto.split(b"\n")
+            for linha in linhas:
+                yield linha.decode("utf-8")
+        if resto:
+            yield resto.decode("utf-8")
+
+
+def _chave(metodo: str, url: str, params) -> tuple:
+    # As requisições são identificadas pelo método, caminho e query string, sem o
+    # domínio, para que a cassete possa ser reproduzida com outro "base_url".
+    partes = urlsplit(url)
+    query = partes.query
+    if params:
+        itens = params.items() if isinstance(params, dict) else params
+        query = "&".join(filter(None, (query, urlencode(sorted(itens), doseq=True))))
+    return metodo.upper(), partes.path, "&".join(sorted(query.split("&")))
+
+
+def _mascarar(dados):
+    if isinstance(dados, dict):
+        return {
+            k: mask_sensitive_data(v) if k in CAMPOS_SENSIVEIS else _mascarar(v)
+            for k, v in dados.items()
+        }
+    if isinstance(dados, list):
+        return [_mascarar(item) for item in dados]
+    return dados
+
+
+def _mascarar_texto(texto: str) -> str:
+    try:
+        dados = json.loads(texto)
+    except ValueError:
+        return texto
+    if isinstance(dados, dict) and any(c in texto for c in CAMPOS_SENSIVEIS):
+        return json.dumps(_mascarar(dados), ensure_ascii=False)
+    return texto
+
+
+class _SessaoCassete(object):
+    # Métodos no formato do `requests.Session`, usados pelo cliente.
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, data=None, **kwargs) -> requests.Response:
+        return self.request("POST", url, data=data, **kwargs)
+
+    def put(self, url: str, data=None, **kwargs) -> requests.Response:
+        return self.request("PUT", url, data=data, **kwargs)
+
+    def patch(self, url: str, data=None, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, data=data, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+
+class _SessaoGravadora(_SessaoCassete):
+    def __init__(self, sessao, gravador: "GravadorCassete"):
+        self.sessao = sessao
+        self.gravador = gravador
+
+    @property
+    def headers(self):
+        return self.sessao.headers
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        inicio = time.monotonic()
+        resposta = self.sessao.request(method, url, **kwargs)
+        # Lê o corpo inteiro, mesmo com stream=True, para gravá-lo. A resposta continua
+        # podendo ser lida com iter_content.
+        conteudo = resposta.content
+        duracao = time.monotonic() - inicio
+        self.gravador.gravar(
+            method,
+            url,
+            kwargs.get("params"),
+            kwargs.get("data"),
+            resposta,
+            conteudo,
+            duracao,
+        )
+        return resposta
+
+    def close(self):
+        self.sessao.close()
+
+
+class _FluxoCassete(object):
+    # Um arquivo da cassete, com um único fluxo gzip (se comprimida), aberto sob
+    # demanda em modo de acréscimo.
+    def __init__(self, caminho: str, comprimida: bool):
+        self.caminho = caminho
+        self.comprimida = comprimida
+        self.arquivo = None
+        self.compressor = None
+        self.lock = threading.Lock()
+
+    def escrever(self, linha: bytes):
+        with self.lock:
+            if self.arquivo is None:
+                # Sem buffer: nada fica pendente em um arquivo herdado por um fork.
+                self.arquivo = open(self.caminho, "ab", buffering=0)
+                if self.comprimida:
+                    self.compressor = zlib.compressobj(wbits=31)
+            if self.compressor is not None:
+                # O Z_SYNC_FLUSH leva o registro ao disco sem reiniciar a compressão.
+                linha = self.compressor.compress(linha)
+                linha += self.compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.arquivo.write(linha)
+
+    def fechar(self):
+        with self.lock:
+            if self.arquivo is not None:
+                if self.compressor is not None:
+                    self.arquivo.write(self.compressor.flush())
+                self.descartar()
+
+    def descartar(self):
+        # Fecha o descritor sem finalizar o fluxo gzip, que no processo filho de um
+        # fork pertence ao pai.
+        if self.arquivo is not None:
+            self.arquivo.close()
+        self.arquivo = None
+        self.compressor = None
+
+
+class GravadorCassete(object):
+    """
+    Grava as requisições feitas pelo cliente, e as respostas recebidas, em uma
+    cassete no disco (um JSON por linha, comprimido se o caminho terminar em ".gz"),
+    para reprodução posterior com `ReprodutorCassete`.
+
+    As credenciais e tokens são mascarados com `mask_sensitive_data` e os headers das
+    requisições, que incluem o token, não são gravados.
+
+    O gravador pode ser herdado por um fork ou serializado junto com o cliente. O
+    processo que o criou grava em `caminho` e os demais em "<caminho>.<pid>", para
+    que cada arquivo tenha um único fluxo gzip. `ReprodutorCassete` lê todos eles.
+    Cada registro é enviado ao disco assim que gravado. O fluxo é finalizado por
+    `fechar` ou no fim do processo.
+
+    Uso: `InterClient(..., transporte=GravadorCassete("dia.jsonl.gz"))`.
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.__pid = os.getpid()
+
+    def envolver(self, sessao):
+        return _SessaoGravadora(sessao, self)
+
+    def gravar(
+        self,
+        metodo: str,
+        url: str,
+        params,
+        data,
+        resposta: requests.Response,
+        conteudo: bytes,
+        duracao: float,
+    ):
+        try:
+            corpo_resposta = {"texto": _mascarar_texto(conteudo.decode("utf-8"))}
+        except UnicodeDecodeError:
+            corpo_resposta = {"base64": base64.b64encode(conteudo).decode("ascii")}
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", "replace")
+        registro = {
+            "metodo": metodo.upper(),
+            "url": url,
+            "params": params,
+            "corpo": _mascarar(data) if isinstance(data, dict) else data,
+            "status": resposta.status_code,
+            "headers": {
+                k: v for k, v in resposta.headers.items() if k.lower() == "content-type"
+            },
+            "duracao": round(duracao, 6),
+            **corpo_resposta,
+        }
+        linha = (json.dumps(registro, ensure_ascii=False, default=str) + "\n").encode(
+            "utf-8"
+        )
+        self.__fluxo().escrever(linha)
+
+    def fechar(self):
+        self.__fluxo().fechar()
+
+    def __fluxo(self) -> _FluxoCassete:
+        caminho = os.path.abspath(self.caminho)
+        if os.getpid() != self.__pid:
+            caminho = f"{caminho}.{os.getpid()}"
+        with _lock_fluxos:
+            if caminho not in _fluxos:
+                _fluxos[caminho] = _FluxoCassete(caminho, _comprimida(self.caminho))
+            return _fluxos[caminho]
+
+    def __getstate__(self):
+        return {"caminho": self.caminho, "pid": self.__pid}
+
+    def __setstate__(self, state):
+        self.__init__(state["caminho"])
+        self.__pid = state["pid"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+
+class _SessaoReprodutora(_SessaoCassete):
+    def __init__(self, reprodutor: "ReprodutorCassete"):
+        self.reprodutor = reprodutor
+        self.headers = CaseInsensitiveDict()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.reprodutor.reproduzir(method, url, kwargs.get("params"))
+
+    def close(self):
+        pass
+
+
+class ReprodutorCassete(object):
+    """
+    Reproduz uma cassete gravada com `GravadorCassete`, sem acesso à rede.
+
+    Cada requisição recebe a próxima resposta gravada para o mesmo método, caminho e
+    query string. Com `velocidade=None` (padrão) as respostas são devolvidas
+    imediatamente. Com `velocidade=1` cada resposta leva o mesmo tempo que levou na
+    gravação, `velocidade=2` leva metade do tempo, e assim por diante. Apenas a
+    latência de cada resposta é reproduzida: o ritmo em que as requisições são feitas
+    continua sendo definido por quem usa o cliente.
+
+    Processos filhos (fork) e cópias serializadas recebem uma cópia das respostas
+    restantes, consumidas de forma independente.
+
+    Parâmetros:
+    - caminho (str): Caminho da cassete.
+    - velocidade (float | None): Fator de velocidade da reprodução.
+    - repetir (bool): Se as respostas podem ser reutilizadas depois que a cassete
+    chega ao fim para uma requisição. Padrão: False, levanta `CasseteError`.
+
+    Uso: `InterClient(..., transporte=ReprodutorCassete("dia.jsonl.gz"))`.
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        velocidade: Union[float, None] = None,
+        repetir: bool = False,
+    ):
+        self.caminho = caminho
+        self.velocidade = velocidade
+        self.repetir = repetir
+        self.__lock = threading.Lock()
+        self.__respostas = defaultdict(deque)
+        _instancias.add(self)
+        for arquivo in _arquivos_cassete(caminho):
+            for linha in _ler_linhas(arquivo, _comprimida(caminho)):
+                if linha.strip():
+                    registro = json.loads(linha)
+                    chave = _chave(
+                        registro["metodo"], registro["url"], registro.get("params")
+                    )
+                    self.__respostas[chave].append(registro)
+
+    def envolver(self, sessao):
+        return _SessaoReprodutora(self)
+
+    def _reiniciar_apos_fork(self):
+        self.__lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_ReprodutorCassete__lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+        _instancias.add(self)
+
+    def reproduzir(self, metodo: str, url: str, params) -> requests.Response:
+        chave = _chave(metodo, url, params)
+        with self.__lock:
+            fila = self.__respostas.get(chave)
+            if not fila:
+                raise CasseteError(
+                    f"Não há resposta gravada para {metodo} {url} (params: {params})."
+                )
+            registro = fila.popleft()
+            if self.repetir:
+                fila.append(registro)
+
+        if self.velocidade:
+            time.sleep(registro.get("duracao", 0) / self.velocidade)
+        return self.__criar_resposta(registro, url)
+
+    def __criar_resposta(self, registro: dict, url: str) -> requests.Response:
+        resposta = requests.Response()
+        resposta.status_code = registro["status"]
+        resposta.headers = CaseInsensitiveDict(registro.get("headers", {}))
+        resposta.url = url
+        resposta.encoding = get_encoding_from_headers(resposta.headers) or "utf-8"
+        if "base64" in registro:
+            resposta._content = base64.b64decode(registro["base64"])
+        else:
+            resposta._content = registro.get("texto", "").encode("utf-8")
+        resposta._content_consumed = True
+        return resposta
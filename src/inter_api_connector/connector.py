@@ -1,8 +1,13 @@
+import base64
 import datetime
 import decimal
+import itertools
 import json
 import logging
-from typing import Literal, Union
+import os
+import re
+import time
+from typing import Dict, Iterable, Iterator, List, Literal, Tuple, Union
 
 import requests
 
@@ -12,34 +17,362 @@ from .error import (
     AuthenticationError,
     Error,
     InvalidRequestError,
+    NotFoundError,
     RateLimitError,
 )
+from .streaming import iterar_itens_json
+from .utils import executar_em_paralelo
 
 logger = logging.getLogger(__name__)
 
+# Quantidade máxima de pagamentos em cada lote enviado à API.
+TAMANHO_MAXIMO_LOTE_PAGAMENTOS = 100
+
+# Erros que não impedem uma nova tentativa da mesma consulta.
+# O requests.RequestException também cobre os erros de rede convertidos pelo
+# transporte HTTP/2.
+ERROS_TRANSITORIOS = (APIError, RateLimitError, requests.RequestException)
+
+# Status em que o lote de pagamentos ainda não tem o resultado de cada pagamento.
+STATUS_LOTE_PAGAMENTOS_EM_PROCESSAMENTO = (
+    "RECEBIDO",
+    "EM_PROCESSAMENTO",
+    "PROCESSANDO",
+)
+
 
 class InterClient(API):
     def verificar_scope(self, scope: str):
         return scope in self.scope
 
-    # TODO: API Cobrança e Cobrança (Boleto com PIX)
-    def emitir_boleto(self, *args, **kwargs):
-        raise NotImplementedError()
+    # API Cobrança (Boleto) e Cobrança (Boleto com PIX)
+    def emitir_boleto(
+        self,
+        seu_numero: str,
+        valor_nominal: Union[decimal.Decimal, str, int, float],
+        data_vencimento: Union[datetime.date, str],
+        num_dias_agenda: int,
+        pagador: dict,
+        api: Literal["cobranca", "cobranca_com_pix"] = "cobranca_com_pix",
+        conta_corrente: Union[str, None] = None,
+        **params,
+    ):
+        self.__verificar_autenticacao()
 
-    def recuperar_colecao_boletos(self, *args, **kwargs):
-        raise NotImplementedError()
+        url_path = self.__get_url_path_boletos(api)
 
-    def recuperar_sumario_boletos(self, *args, **kwargs):
-        raise NotImplementedError()
+        data = {
+            "seuNumero": seu_numero,
+            "valorNominal": self.__formatar_valor_boleto(valor_nominal),
+            "dataVencimento": self.__formatar_data(data_vencimento),
+            "numDiasAgenda": num_dias_agenda,
+            "pagador": pagador,
+            **params,
+        }
+        headers = self.__get_headers(conta_corrente)
 
-    def recuperar_boleto_detalhado(self, *args, **kwargs):
-        raise NotImplementedError()
+        response = self.enviar_request_autenticada(
+            "POST", url=self.base_url + url_path, data=json.dumps(data), headers=headers
+        )
 
-    def recuperar_boleto_em_pdf(self, *args, **kwargs):
-        raise NotImplementedError()
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
 
-    def cancelar_boleto(self, *args, **kwargs):
-        raise NotImplementedError()
+        return response.json()
+
+    def emitir_boletos_em_lote(
+        self,
+        boletos: Iterable[dict],
+        api: Literal["cobranca", "cobranca_com_pix"] = "cobranca_com_pix",
+        conta_corrente: Union[str, None] = None,
+        max_workers: int = 8,
+    ) -> List[Tuple[dict, Union[dict, Exception]]]:
+        """
+        Emite vários boletos em paralelo. Cada item de `boletos` é um dict com os
+        argumentos de `emitir_boleto`.
+
+        Todos os boletos são emitidos antes do retorno. Retorna uma lista de tuplas
+        (boleto, resposta), na ordem em que as emissões terminaram. Se a emissão de
+        um boleto falhar, a resposta é a exceção levantada.
+        """
+        # Autentica antes de disparar as threads, para que elas não tentem obter o
+        # token ao mesmo tempo.
+        self.__verificar_autenticacao()
+
+        def emitir(boleto: dict):
+            return self.emitir_boleto(
+                **{"api": api, "conta_corrente": conta_corrente, **boleto}
+            )
+
+        return list(executar_em_paralelo(emitir, boletos, max_workers=max_workers))
+
+    def recuperar_colecao_boletos(
+        self,
+        data_inicial: Union[datetime.date, str],
+        data_final: Union[datetime.date, str],
+        pagina_atual: int = 0,
+        itens_por_pagina: int = 100,
+        api: Literal["cobranca", "cobranca_com_pix"] = "cobranca_com_pix",
+        conta_corrente: Union[str, None] = None,
+        **params,
+    ):
+        self.__verificar_autenticacao()
+
+        url_path = self.__get_url_path_boletos(api)
+
+        # A API v3 usa os parâmetros de paginação com o prefixo "paginacao.".
+        prefixo_paginacao = "" if api == "cobranca" else "paginacao."
+        query_params = {
+            "dataInicial": self.__formatar_data(data_inicial),
+            "dataFinal": self.__formatar_data(data_final),
+            f"{prefixo_paginacao}paginaAtual": pagina_atual,
+            f"{prefixo_paginacao}itensPorPagina": itens_por_pagina,
+            **params,
+        }
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "GET", url=self.base_url + url_path, params=query_params, headers=headers
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        return response.json()
+
+    def iterar_colecao_boletos(
+        self,
+        data_inicial: Union[datetime.date, str],
+        data_final: Union[datetime.date, str],
+        itens_por_pagina: int = 1000,
+        api: Literal["cobranca", "cobranca_com_pix"] = "cobranca_com_pix",
+        conta_corrente: Union[str, None] = None,
+        **params,
+    ) -> Iterator[dict]:
+        """
+        Percorre todas as páginas de `recuperar_colecao_boletos`, retornando um
+        boleto por vez.
+        """
+        # A API v2 retorna os boletos em "content" e a v3 em "cobrancas".
+        chave_itens = "content" if api == "cobranca" else "cobrancas"
+        chave_ultima_pagina = "last" if api == "cobranca" else "ultimaPagina"
+        chave_numero_pagina = "number" if api == "cobranca" else "paginaAtual"
+        pagina_atual = 0
+        itens_anteriores = None
+        while True:
+            pagina = self.recuperar_colecao_boletos(
+                data_inicial,
+                data_final,
+                pagina_atual=pagina_atual,
+                itens_por_pagina=itens_por_pagina,
+                api=api,
+                conta_corrente=conta_corrente,
+                **params,
+            )
+            itens = pagina.get(chave_itens, [])
+            # Se a API ignorar a página pedida e repetir a anterior, a iteração para em
+            # vez de retornar os mesmos boletos para sempre.
+            numero_pagina = pagina.get(chave_numero_pagina, pagina_atual)
+            if not itens or numero_pagina != pagina_atual or itens == itens_anteriores:
+                return
+            yield from itens
+            if pagina.get(chave_ultima_pagina, True):
+                return
+            itens_anteriores = itens
+            pagina_atual += 1
+
+    def recuperar_sumario_boletos(
+        self,
+        data_inicial: Union[datetime.date, str],
+        data_final: Union[datetime.date, str],
+        api: Literal["cobranca", "cobranca_com_pix"] = "cobranca_com_pix",
+        conta_corrente: Union[str, None] = None,
+        **params,
+    ):
+        self.__verificar_autenticacao()
+
+        url_path = self.__get_url_path_boletos(api) + "/sumario"
+
+        query_params = {
+            "dataInicial": self.__formatar_data(data_inicial),
+            "dataFinal": self.__formatar_data(data_final),
+            **params,
+        }
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "GET", url=self.base_url + url_path, params=query_params, headers=headers
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        return response.json()
+
+    def recuperar_boleto_detalhado(
+        self,
+        codigo_solicitacao: str,
+        api: Literal["cobranca", "cobranca_com_pix"] = "cobranca_com_pix",
+        conta_corrente: Union[str, None] = None,
+    ):
+        self.__verificar_autenticacao()
+
+        url_path = f"{self.__get_url_path_boletos(api)}/{codigo_solicitacao}"
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "GET", url=self.base_url + url_path, headers=headers
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        return response.json()
+
+    def recuperar_boleto_em_pdf(
+        self,
+        codigo_solicitacao: str,
+        caminho: Union[str, os.PathLike, None] = None,
+        api: Literal["cobranca", "cobranca_com_pix"] = "cobranca_com_pix",
+        conta_corrente: Union[str, None] = None,
+    ) -> Union[bytes, str, os.PathLike]:
+        """
+        Recupera o PDF do boleto. Sem `caminho`, retorna o conteúdo do PDF em bytes.
+        Com `caminho`, a resposta é decodificada e gravada no arquivo à medida que é
+        recebida, sem carregar o PDF inteiro na memória, e o caminho é retornado.
+        """
+        self.__verificar_autenticacao()
+
+        url_path = f"{self.__get_url_path_boletos(api)}/{codigo_solicitacao}/pdf"
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "GET",
+            url=self.base_url + url_path,
+            headers=headers,
+            stream=caminho is not None,
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        if caminho is None:
+            return base64.b64decode(response.json()["pdf"])
+
+        try:
+            with open(caminho, "wb") as arquivo:
+                self.__gravar_pdf_base64(response, arquivo)
+        except BaseException:
+            if os.path.exists(caminho):
+                os.remove(caminho)
+            raise
+        finally:
+            response.close()
+        return caminho
+
+    def baixar_boletos_em_pdf(
+        self,
+        codigos_solicitacao: Iterable[str],
+        diretorio: Union[str, os.PathLike],
+        api: Literal["cobranca", "cobranca_com_pix"] = "cobranca_com_pix",
+        conta_corrente: Union[str, None] = None,
+        max_workers: int = 8,
+    ) -> List[Tuple[str, Union[str, Exception]]]:
+        """
+        Baixa os PDFs de vários boletos em paralelo, gravando cada um em
+        `diretorio/<codigo_solicitacao>.pdf`.
+
+        Todos os PDFs são baixados antes do retorno. Retorna uma lista de tuplas
+        (codigo_solicitacao, caminho), na ordem em que os downloads terminaram. Se um
+        download falhar, o caminho é a exceção levantada.
+        """
+        self.__verificar_autenticacao()
+        os.makedirs(diretorio, exist_ok=True)
+
+        def baixar(codigo_solicitacao: str):
+            return self.recuperar_boleto_em_pdf(
+                codigo_solicitacao,
+                os.path.join(diretorio, f"{codigo_solicitacao}.pdf"),
+                api=api,
+                conta_corrente=conta_corrente,
+            )
+
+        return list(executar_em_paralelo(baixar, codigos_solicitacao, max_workers))
+
+    def cancelar_boleto(
+        self,
+        codigo_solicitacao: str,
+        motivo_cancelamento: str,
+        api: Literal["cobranca", "cobranca_com_pix"] = "cobranca_com_pix",
+        conta_corrente: Union[str, None] = None,
+    ):
+        self.__verificar_autenticacao()
+
+        url_path = f"{self.__get_url_path_boletos(api)}/{codigo_solicitacao}/cancelar"
+        data = {"motivoCancelamento": motivo_cancelamento}
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "POST", url=self.base_url + url_path, data=json.dumps(data), headers=headers
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        return True
+
+    def __get_url_path_boletos(self, api: Literal["cobranca", "cobranca_com_pix"]):
+        if api == "cobranca":
+            return "cobranca/v2/boletos"
+        elif api == "cobranca_com_pix":
+            return "cobranca/v3/cobrancas"
+        raise ValueError(
+            'O "api" deve ser "cobranca" ou "cobranca_com_pix", '
+            f"valor fornecido: {api}"
+        )
+
+    def __formatar_valor_boleto(
+        self, valor: Union[decimal.Decimal, str, int, float]
+    ) -> str:
+        try:
+            valor_decimal = decimal.Decimal(str(valor))
+        except decimal.InvalidOperation:
+            valor_decimal = decimal.Decimal(0)
+        if valor_decimal <= decimal.Decimal(0):
+            raise ValueError(f'O "valor_nominal" do boleto é inválido: {valor}')
+        return "{:.2f}".format(valor_decimal)
+
+    def __formatar_data(self, data: Union[datetime.date, str]) -> str:
+        if isinstance(data, datetime.datetime):
+            return data.date().isoformat()
+        if isinstance(data, datetime.date):
+            return data.isoformat()
+        return data
+
+    def __gravar_pdf_base64(self, response: requests.Response, arquivo):
+        # O PDF vem em base64 dentro de um JSON ({"pdf": "..."}). O valor é localizado
+        # e decodificado em blocos de tamanho múltiplo de 4, gravados conforme chegam.
+        buffer = b""
+        inicio_encontrado = False
+        for bloco in response.iter_content(chunk_size=64 * 1024):
+            buffer += bloco
+            if not inicio_encontrado:
+                match = re.search(rb'"pdf"\s*:\s*"', buffer)
+                if not match:
+                    continue
+                buffer = buffer[match.end() :]
+                inicio_encontrado = True
+            fim = buffer.find(b'"')
+            if fim != -1:
+                buffer = buffer[:fim].replace(b"\\", b"")
+                break
+            buffer = buffer.replace(b"\\", b"")
+            tamanho = len(buffer) - len(buffer) % 4
+            arquivo.write(base64.b64decode(buffer[:tamanho]))
+            buffer = buffer[tamanho:]
+        else:
+            raise APIError('A resposta do PDF do boleto não contém o campo "pdf".')
+        arquivo.write(base64.b64decode(buffer))
 
     # TODO: API Banking
     def consultar_extrato(
@@ -50,6 +383,38 @@ class InterClient(API):
         conta_corrente: Union[str, None] = None,
         **params,
     ):
+        return self.__enviar_consulta_extrato(
+            data_inicio, data_fim, tipo_extrato, conta_corrente, False, **params
+        ).json()
+
+    def iterar_extrato(
+        self,
+        data_inicio: datetime.datetime,
+        data_fim: datetime.datetime,
+        tipo_extrato: Literal["padrao", "enriquecido"] = "enriquecido",
+        conta_corrente: Union[str, None] = None,
+        **params,
+    ) -> Iterator[dict]:
+        """
+        Igual a `consultar_extrato`, mas lê a resposta à medida que ela chega e
+        retorna uma transação por vez, sem carregar o extrato inteiro na memória.
+        """
+        if tipo_extrato == "pdf":
+            raise ValueError('O extrato "pdf" não pode ser lido por transação.')
+        response = self.__enviar_consulta_extrato(
+            data_inicio, data_fim, tipo_extrato, conta_corrente, True, **params
+        )
+        return self.__iterar_resposta(response, "transacoes")
+
+    def __enviar_consulta_extrato(
+        self,
+        data_inicio: datetime.datetime,
+        data_fim: datetime.datetime,
+        tipo_extrato: Literal["padrao", "pdf", "enriquecido"],
+        conta_corrente: Union[str, None],
+        stream: bool,
+        **params,
+    ) -> requests.Response:
         self.__verificar_autenticacao()
 
         self.__validar_tipo_extrato(tipo_extrato)
@@ -64,13 +429,29 @@ class InterClient(API):
         headers = self.__get_headers(conta_corrente)
 
         response = self.enviar_request_autenticada(
-            "GET", url=self.base_url + url_path, params=query_params, headers=headers
+            "GET",
+            url=self.base_url + url_path,
+            params=query_params,
+            headers=headers,
+            stream=stream,
         )
 
         if not response.ok:
             self.__raise_erro_codigo_http_invalido(response)
 
-        return response.json()
+        return response
+
+    def __iterar_resposta(self, response: requests.Response, chave: str):
+        # Lê os itens da lista em "chave" conforme o corpo da resposta chega.
+        def iterar():
+            try:
+                yield from iterar_itens_json(
+                    response.iter_content(chunk_size=64 * 1024), chave
+                )
+            finally:
+                response.close()
+
+        return iterar()
 
     def __detectar_url_path_consultar_extrato(
         self, tipo_extrato: Literal["padrao", "pdf", "enriquecido"]
@@ -93,27 +474,297 @@ class InterClient(API):
                 f"valor fornecido: {tipo_extrato}"
             )
 
-    def consultar_saldo(self, *args, **kwargs):
-        raise NotImplementedError()
+    def consultar_saldo(
+        self,
+        data_saldo: Union[datetime.date, str, None] = None,
+        conta_corrente: Union[str, None] = None,
+        usar_cache: bool = True,
+    ):
+        """
+        Consulta o saldo da conta. Com `ttl_cache_saldo` configurado no cliente, o
+        saldo é reaproveitado por esse tempo, a não ser que `usar_cache` seja False.
+        """
+        self.__verificar_autenticacao()
+
+        query_params = {}
+        if data_saldo:
+            query_params["dataSaldo"] = self.__formatar_data(data_saldo)
+        headers = self.__get_headers(conta_corrente)
+
+        def consultar():
+            response = self.enviar_request_autenticada(
+                "GET",
+                url=self.base_url + "banking/v2/saldo",
+                params=query_params,
+                headers=headers,
+            )
+
+            if not response.ok:
+                self.__raise_erro_codigo_http_invalido(response)
+
+            return response.json()
+
+        if not usar_cache:
+            return consultar()
+        chave = (conta_corrente or self.conta_corrente, query_params.get("dataSaldo"))
+        return self.cache_saldo.obter(chave, consultar)
+
+    def consultar_saldos(
+        self,
+        contas_correntes: Iterable[str],
+        data_saldo: Union[datetime.date, str, None] = None,
+        usar_cache: bool = True,
+        max_workers: int = 8,
+    ) -> Dict[str, Union[dict, Exception]]:
+        """
+        Consulta o saldo de várias contas em paralelo e retorna um dict
+        {conta_corrente: saldo}. Se a consulta de uma conta falhar, o valor é a
+        exceção levantada.
+        """
+        self.__verificar_autenticacao()
+
+        def consultar(conta_corrente: str):
+            return self.consultar_saldo(data_saldo, conta_corrente, usar_cache)
+
+        return dict(
+            executar_em_paralelo(
+                consultar, dict.fromkeys(contas_correntes), max_workers
+            )
+        )
 
     def incluir_pagamento(
-        self, tipo: Literal["cod_barras", "darf", "pix"], *args, **kwargs
+        self,
+        tipo: Literal["cod_barras", "darf", "pix"],
+        conta_corrente: Union[str, None] = None,
+        **params,
     ):
-        raise NotImplementedError()
+        self.__verificar_autenticacao()
+
+        url_path = self.__get_url_path_incluir_pagamento(tipo)
+
+        data = {**params}
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "POST", url=self.base_url + url_path, data=json.dumps(data), headers=headers
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        return response.json()
+
+    def __get_url_path_incluir_pagamento(
+        self, tipo: Literal["cod_barras", "darf", "pix"]
+    ):
+        paths = {
+            "cod_barras": "banking/v2/pagamento",
+            "darf": "banking/v2/pagamento/darf",
+            "pix": "banking/v2/pix",
+        }
+        if tipo not in paths:
+            raise ValueError(
+                'O "tipo" deve ser "cod_barras", "darf" ou "pix", '
+                f"valor fornecido: {tipo}"
+            )
+        return paths[tipo]
 
     def consultar_pagamentos(
         self, tipo: Literal["cod_barras", "darf", "pix"], *args, **kwargs
     ):
         raise NotImplementedError()
 
-    def incluir_pagamentos_em_lote(self, *args, **kwargs):
-        raise NotImplementedError()
+    def incluir_lote_pagamentos(
+        self,
+        pagamentos: List[dict],
+        meu_identificador: Union[str, None] = None,
+        conta_corrente: Union[str, None] = None,
+    ):
+        """
+        Inclui um único lote de pagamentos. Cada pagamento é um dict com os campos da
+        API e o "tipoPagamento" ("BOLETO", "DARF" ou "PIX") ou o "tipo" ("cod_barras",
+        "darf" ou "pix").
+        """
+        self.__verificar_autenticacao()
 
-    def consultar_pagamentos_em_lote(self, *args, **kwargs):
-        raise NotImplementedError()
+        if not pagamentos or len(pagamentos) > TAMANHO_MAXIMO_LOTE_PAGAMENTOS:
+            raise ValueError(
+                "O lote deve ter entre 1 e "
+                f"{TAMANHO_MAXIMO_LOTE_PAGAMENTOS} pagamentos, "
+                f"quantidade fornecida: {len(pagamentos)}"
+            )
 
-    def cancelar_agendamento_pagamento(self, *args, **kwargs):
-        raise NotImplementedError()
+        url_path = "banking/v2/pagamento/lote"
+
+        data = {"pagamentos": [self.__formatar_pagamento_lote(p) for p in pagamentos]}
+        if meu_identificador:
+            data["meuIdentificador"] = meu_identificador
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "POST", url=self.base_url + url_path, data=json.dumps(data), headers=headers
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        return response.json()
+
+    def incluir_pagamentos_em_lote(
+        self,
+        pagamentos: Iterable[dict],
+        meu_identificador: Union[str, None] = None,
+        tamanho_lote: int = TAMANHO_MAXIMO_LOTE_PAGAMENTOS,
+        conta_corrente: Union[str, None] = None,
+        max_workers: int = 4,
+    ) -> List[Tuple[List[dict], Union[dict, Exception]]]:
+        """
+        Divide uma lista de pagamentos de qualquer tamanho em lotes de até
+        `tamanho_lote` itens e os inclui em paralelo.
+
+        `pagamentos` é consumido sob demanda, então pode ser um gerador. Cada lote
+        recebe o identificador "<meu_identificador>-<número do lote>".
+
+        Todos os lotes são enviados antes do retorno. Retorna uma lista de tuplas
+        (pagamentos do lote, resposta), na ordem em que as inclusões terminaram. Se a
+        inclusão de um lote falhar, a resposta é a exceção levantada. Os "idLote"
+        retornados podem ser acompanhados com `acompanhar_pagamentos_em_lote`.
+        """
+        if not 0 < tamanho_lote <= TAMANHO_MAXIMO_LOTE_PAGAMENTOS:
+            raise ValueError(
+                f'O "tamanho_lote" deve estar entre 1 e '
+                f"{TAMANHO_MAXIMO_LOTE_PAGAMENTOS}, valor fornecido: {tamanho_lote}"
+            )
+
+        self.__verificar_autenticacao()
+
+        def dividir_em_lotes():
+            iterador = iter(pagamentos)
+            for numero in itertools.count(1):
+                lote = list(itertools.islice(iterador, tamanho_lote))
+                if not lote:
+                    return
+                yield numero, lote
+
+        def incluir(lote: Tuple[int, List[dict]]):
+            numero, itens = lote
+            return self.incluir_lote_pagamentos(
+                itens,
+                f"{meu_identificador}-{numero}" if meu_identificador else None,
+                conta_corrente=conta_corrente,
+            )
+
+        return [
+            (itens, resposta)
+            for (_, itens), resposta in executar_em_paralelo(
+                incluir, dividir_em_lotes(), max_workers
+            )
+        ]
+
+    def __formatar_pagamento_lote(self, pagamento: dict):
+        if "tipoPagamento" in pagamento:
+            return pagamento
+        tipos = {"cod_barras": "BOLETO", "darf": "DARF", "pix": "PIX"}
+        dados = {k: v for k, v in pagamento.items() if k != "tipo"}
+        tipo = pagamento.get("tipo")
+        if tipo not in tipos:
+            raise ValueError(
+                'Cada pagamento deve ter o "tipoPagamento" ou o "tipo" ("cod_barras", '
+                f'"darf" ou "pix"), valor fornecido: {tipo}'
+            )
+        return {"tipoPagamento": tipos[tipo], **dados}
+
+    def consultar_pagamentos_em_lote(
+        self, id_lote: str, conta_corrente: Union[str, None] = None
+    ):
+        self.__verificar_autenticacao()
+
+        url_path = f"banking/v2/pagamento/lote/{id_lote}"
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "GET", url=self.base_url + url_path, headers=headers
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        return response.json()
+
+    def acompanhar_pagamentos_em_lote(
+        self,
+        ids_lote: Iterable[str],
+        conta_corrente: Union[str, None] = None,
+        intervalo_inicial: float = 2,
+        intervalo_maximo: float = 60,
+        fator_backoff: float = 2,
+        timeout: Union[float, None] = None,
+        max_workers: int = 4,
+    ) -> Iterator[Tuple[str, dict]]:
+        """
+        Acompanha vários lotes até que saiam dos status de processamento, consultando
+        cada um com back-off exponencial, e retorna os pagamentos de cada lote assim
+        que ele termina.
+
+        Erros de rede e da API em uma consulta apenas adiam a próxima consulta do
+        lote, com o mesmo back-off.
+
+        Retorna um iterator de tuplas (idLote, pagamento). Levanta `TimeoutError` se
+        `timeout` segundos se passarem com lotes ainda em processamento.
+        """
+        self.__verificar_autenticacao()
+
+        inicio = time.monotonic()
+        # idLote -> (horário da próxima consulta, intervalo atual)
+        pendentes = {
+            id_lote: (inicio, intervalo_inicial) for id_lote in dict.fromkeys(ids_lote)
+        }
+
+        def consultar(id_lote: str):
+            return self.consultar_pagamentos_em_lote(id_lote, conta_corrente)
+
+        while pendentes:
+            agora = time.monotonic()
+            devidos = [i for i, (proxima, _) in pendentes.items() if proxima <= agora]
+            for id_lote, lote in executar_em_paralelo(consultar, devidos, max_workers):
+                _, intervalo = pendentes[id_lote]
+                if isinstance(lote, ERROS_TRANSITORIOS):
+                    logger.debug(f"Erro ao consultar o lote {id_lote}: {lote}")
+                elif isinstance(lote, Exception):
+                    raise lote
+                elif lote.get("status") not in STATUS_LOTE_PAGAMENTOS_EM_PROCESSAMENTO:
+                    del pendentes[id_lote]
+                    for pagamento in lote.get("pagamentos", []):
+                        yield id_lote, pagamento
+                    continue
+                intervalo = min(intervalo * fator_backoff, intervalo_maximo)
+                pendentes[id_lote] = (time.monotonic() + intervalo, intervalo)
+
+            if not pendentes:
+                return
+            proxima = min(proxima for proxima, _ in pendentes.values())
+            if timeout is not None and proxima - inicio > timeout:
+                raise TimeoutError(
+                    f"Os lotes {list(pendentes)} não terminaram em {timeout} segundos."
+                )
+            time.sleep(max(proxima - time.monotonic(), 0))
+
+    def cancelar_agendamento_pagamento(
+        self, codigo_transacao: str, conta_corrente: Union[str, None] = None
+    ):
+        self.__verificar_autenticacao()
+
+        url_path = f"banking/v2/pagamento/{codigo_transacao}"
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "DELETE", url=self.base_url + url_path, headers=headers
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        return True
 
     # TODO: API Pix
     def criar_cobranca_pix(
@@ -245,13 +896,15 @@ class InterClient(API):
         elif response.status_code == 403 or response.status_code == 401:
             raise AuthenticationError(f"Error de autenticação: {response.text}")
         elif response.status_code == 404:
-            raise InvalidRequestError(
+            raise NotFoundError(
                 f"O objeto solicitado não foi encontrado: {response.text}"
             )
         elif response.status_code == 500:
             raise APIError(f"Houve um erro no servidor do inter: {response.text}")
         elif response.status_code == 503:
             raise APIError(f"O serviço não está disponível no momento: {response.text}")
+        elif response.status_code in (502, 504):
+            raise APIError(f"O gateway do inter não respondeu: {response.text}")
         elif not response.ok:
             raise Error(
                 f"Erro genérico ao fazer a requisição: {response.status_code} - {response.text}"
@@ -310,6 +963,35 @@ class InterClient(API):
 
         return response.json()
 
+    def consultar_cobranca_pix_por_txid(
+        self,
+        tipo_cobranca: Literal["imediata", "com_vencimento"],
+        txid: str,
+        conta_corrente: Union[str, None] = None,
+    ):
+        self.__verificar_autenticacao()
+
+        if tipo_cobranca == "imediata":
+            url_path = f"pix/v2/cob/{txid}"
+        elif tipo_cobranca == "com_vencimento":
+            url_path = f"pix/v2/cobv/{txid}"
+        else:
+            raise ValueError(
+                '"tipo_cobranca" deve ser "imediata" ou "com_vencimento", '
+                f"valor fornecido: {tipo_cobranca}"
+            )
+
+        headers = self.__get_headers(conta_corrente)
+
+        response = self.enviar_request_autenticada(
+            "GET", url=self.base_url + url_path, headers=headers
+        )
+
+        if not response.ok:
+            self.__raise_erro_codigo_http_invalido(response)
+
+        return response.json()
+
     def consultar_cobrancas_pix_recebidas(
         self,
         inicio: datetime.datetime,
@@ -319,6 +1001,38 @@ class InterClient(API):
         conta_corrente: Union[str, None] = None,
         **params,
     ):
+        return self.__enviar_consulta_pix_recebidas(
+            inicio, fim, pagina_atual, itens_por_pagina, conta_corrente, False, **params
+        ).json()
+
+    def iterar_cobrancas_pix_recebidas(
+        self,
+        inicio: datetime.datetime,
+        fim: datetime.datetime,
+        pagina_atual: int = 0,
+        itens_por_pagina: int = 1000,
+        conta_corrente: Union[str, None] = None,
+        **params,
+    ) -> Iterator[dict]:
+        """
+        Igual a `consultar_cobrancas_pix_recebidas`, mas lê a resposta à medida que
+        ela chega e retorna um PIX por vez, sem carregar a página inteira na memória.
+        """
+        response = self.__enviar_consulta_pix_recebidas(
+            inicio, fim, pagina_atual, itens_por_pagina, conta_corrente, True, **params
+        )
+        return self.__iterar_resposta(response, "pix")
+
+    def __enviar_consulta_pix_recebidas(
+        self,
+        inicio: datetime.datetime,
+        fim: datetime.datetime,
+        pagina_atual: int,
+        itens_por_pagina: int,
+        conta_corrente: Union[str, None],
+        stream: bool,
+        **params,
+    ) -> requests.Response:
         # Verifica se está autenticado, tenta re-autenticar (token expirado, por exemplo)
         # se necessário.
         self.__verificar_autenticacao()
@@ -341,14 +1055,18 @@ class InterClient(API):
 
         # Envia a requisição autenticada
         response = self.enviar_request_autenticada(
-            "GET", url=self.base_url + url_path, headers=headers, params=queries
+            "GET",
+            url=self.base_url + url_path,
+            headers=headers,
+            params=queries,
+            stream=stream,
         )
 
         # Valida o código HTTP
         if not response.ok:
             self.__raise_erro_codigo_http_invalido(response)
 
-        return response.json()
+        return response
 
     def __valida_inicio_fim(self, inicio: datetime.datetime, fim: datetime.datetime):
         if (
@@ -483,6 +1201,36 @@ class InterClient(API):
         conta_corrente: Union[str, None] = None,
         **params,
     ):
+        return self.__enviar_consulta_callbacks(
+            api, inicio, fim, conta_corrente, False, **params
+        ).json()
+
+    def iterar_callbacks_webhook(
+        self,
+        api: Literal["banking", "cobranca", "cobranca_com_pix", "pix"],
+        inicio: datetime.datetime,
+        fim: datetime.datetime,
+        conta_corrente: Union[str, None] = None,
+        **params,
+    ) -> Iterator[dict]:
+        """
+        Igual a `consultar_callbacks_webhook`, mas lê a resposta à medida que ela
+        chega e retorna um callback por vez, sem carregar a página inteira na memória.
+        """
+        response = self.__enviar_consulta_callbacks(
+            api, inicio, fim, conta_corrente, True, **params
+        )
+        return self.__iterar_resposta(response, "data")
+
+    def __enviar_consulta_callbacks(
+        self,
+        api: Literal["banking", "cobranca", "cobranca_com_pix", "pix"],
+        inicio: datetime.datetime,
+        fim: datetime.datetime,
+        conta_corrente: Union[str, None],
+        stream: bool,
+        **params,
+    ) -> requests.Response:
         self.__verificar_autenticacao()
 
         url_path = self.__get_url_path_consultar_callbacks(api)
@@ -496,13 +1244,17 @@ class InterClient(API):
         }
 
         response = self.enviar_request_autenticada(
-            "GET", url=self.base_url + url_path, headers=headers, params=query_params
+            "GET",
+            url=self.base_url + url_path,
+            headers=headers,
+            params=query_params,
+            stream=stream,
         )
 
         if not response.ok:
             self.__raise_erro_codigo_http_invalido(response)
 
-        return response.json()
+        return response
 
     def __get_url_path_consultar_callbacks(self, api):
         if api == "banking":
@@ -8,6 +8,12 @@ class InvalidRequestError(Error):
     """
 
 
+class NotFoundError(InvalidRequestError):
+    """
+    O objeto solicitado não foi encontrado.
+    """
+
+
 class APIError(Error):
     """
     Houve algum erro do lado do Banco Inter, não relacionado aos dados fornecidos pelo usuário.
@@ -24,3 +30,16 @@ class AuthenticationError(Error):
     """
     Há algum problema com a sua autenticação do Inter.
     """
+
+
+class CasseteError(Error):
+    """
+    Não há uma resposta gravada na cassete para a requisição reproduzida.
+    """
+
+
+class CircuitBreakerError(APIError):
+    """
+    O circuit breaker está aberto após falhas seguidas do Inter. A requisição não foi
+    enviada.
+    """
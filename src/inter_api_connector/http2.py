@@ -0,0 +1,191 @@
+import contextlib
+import os
+import secrets
+import ssl
+import tempfile
+from typing import Union
+
+import requests
+from cryptography.hazmat.primitives import serialization
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def criar_contexto_ssl(cert: tuple) -> ssl.SSLContext:
+    """
+    Cria um contexto SSL com o certificado e a chave do cliente (objetos do
+    cryptography, como carregados em `API.__init__`).
+
+    O módulo `ssl` só carrega certificados a partir de arquivos, então o certificado e a
+    chave são gravados em um arquivo em memória (`memfd`, no Linux) ou, na falta dele,
+    em um arquivo temporário acessível apenas pelo usuário atual, apagado logo após o
+    carregamento. Em ambos os casos a chave é criptografada com uma senha aleatória,
+    usada uma única vez.
+    """
+    contexto = ssl.create_default_context()
+    certificado, chave = cert if cert else (None, None)
+    if certificado is None or chave is None:
+        return contexto
+
+    senha = secrets.token_bytes(32)
+    pem = certificado.public_bytes(serialization.Encoding.PEM) + chave.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.BestAvailableEncryption(senha),
+    )
+
+    if hasattr(os, "memfd_create"):
+        descritor = os.memfd_create("inter_api_connector_cert")
+        try:
+            os.write(descritor, pem)
+            contexto.load_cert_chain(f"/proc/self/fd/{descritor}", password=senha)
+        finally:
+            os.close(descritor)
+        return contexto
+
+    descritor, caminho = tempfile.mkstemp(suffix=".pem")
+    try:
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(pem)
+        contexto.load_cert_chain(caminho, password=senha)
+    finally:
+        os.remove(caminho)
+    return contexto
+
+
+@contextlib.contextmanager
+def _converter_erros():
+    # Converte os erros de rede do httpx nos equivalentes do requests, que são os
+    # tratados pelo restante do cliente.
+    try:
+        yield
+    except httpx.TimeoutException as e:
+        raise requests.Timeout(str(e)) from e
+    except httpx.TransportError as e:
+        raise requests.ConnectionError(str(e)) from e
+
+
+class _CorpoStream(object):
+    # Expõe o corpo de uma resposta do httpx com a interface de leitura que o
+    # `requests.Response.iter_content` espera encontrar em `raw`.
+    def __init__(self, resposta):
+        self.resposta = resposta
+
+    def stream(self, chunk_size: int = 1024, decode_content: bool = True):
+        with _converter_erros():
+            yield from self.resposta.iter_bytes(chunk_size)
+
+    def close(self):
+        self.resposta.close()
+
+
+class HTTP2Session(object):
+    """
+    Substituto do `requests.Session` que faz as requisições via HTTP/2, com o httpx.
+
+    Todas as requisições são multiplexadas em até `max_conexoes` conexões mTLS, com
+    compressão de headers (HPACK), em vez de um socket e um handshake TLS por
+    requisição simultânea. É seguro usar a mesma sessão em várias threads.
+
+    As respostas são convertidas para `requests.Response`, então o restante do cliente
+    funciona sem alterações. Requer o pacote opcional `httpx[http2]`
+    (`pip install inter_api_connector[http2]`).
+    """
+
+    def __init__(
+        self,
+        cert: Union[tuple, None] = None,
+        max_conexoes: int = 1,
+        timeout: Union[float, None] = 60,
+    ):
+        if httpx is None:
+            raise ImportError(
+                'O transporte HTTP/2 requer o pacote "httpx[http2]". Instale com: '
+                "pip install inter_api_connector[http2]"
+            )
+        self.headers = CaseInsensitiveDict()
+        self.client = httpx.Client(
+            http2=True,
+            verify=criar_contexto_ssl(cert),
+            limits=httpx.Limits(
+                max_connections=max_conexoes, max_keepalive_connections=max_conexoes
+            ),
+            timeout=timeout,
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params=None,
+        data=None,
+        headers=None,
+        stream: bool = False,
+        timeout=None,
+        **kwargs,
+    ) -> requests.Response:
+        # O certificado do cliente já está no contexto SSL, então o "cert" é ignorado.
+        kwargs.pop("cert", None)
+
+        headers_requisicao = CaseInsensitiveDict(self.headers)
+        headers_requisicao.update(headers or {})
+        headers_requisicao = {
+            k: v for k, v in headers_requisicao.items() if v is not None
+        }
+
+        # O requests aceita o corpo já serializado ou um dict de formulário em "data".
+        corpo = {}
+        if isinstance(data, (str, bytes)):
+            corpo["content"] = data
+        elif data is not None:
+            corpo["data"] = data
+
+        requisicao = self.client.build_request(
+            method,
+            url,
+            params=params,
+            headers=headers_requisicao,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            **corpo,
+            **kwargs,
+        )
+        with _converter_erros():
+            resposta = self.client.send(requisicao, stream=stream)
+        return self.__converter_resposta(resposta, stream)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, data=None, **kwargs) -> requests.Response:
+        return self.request("POST", url, data=data, **kwargs)
+
+    def put(self, url: str, data=None, **kwargs) -> requests.Response:
+        return self.request("PUT", url, data=data, **kwargs)
+
+    def patch(self, url: str, data=None, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, data=data, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+    def __converter_resposta(self, resposta, stream: bool) -> requests.Response:
+        convertida = requests.Response()
+        convertida.status_code = resposta.status_code
+        convertida.headers = CaseInsensitiveDict(resposta.headers)
+        convertida.url = str(resposta.url)
+        convertida.reason = resposta.reason_phrase
+        convertida.encoding = get_encoding_from_headers(convertida.headers)
+        if stream:
+            convertida.raw = _CorpoStream(resposta)
+        else:
+            convertida._content = resposta.content
+            convertida._content_consumed = True
+        return convertida
@@ -0,0 +1,346 @@
+import datetime
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Literal, NamedTuple, Union
+
+from .error import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+STATUS_FINAIS = (
+    "CONCLUIDA",
+    "REMOVIDA_PELO_USUARIO_RECEBEDOR",
+    "REMOVIDA_PELO_PSP",
+    "EXPIRADA",
+)
+
+
+# Horário de Brasília (America/Sao_Paulo), sem horário de verão desde 2019. O
+# `zoneinfo` não está disponível no Python 3.8.
+FUSO_BRASILIA = datetime.timezone(datetime.timedelta(hours=-3), "America/Sao_Paulo")
+
+
+class EventoStatus(NamedTuple):
+    txid: str
+    status_anterior: Union[str, None]
+    status_novo: str
+    cobranca: Union[dict, None]
+
+
+class _CobrancaAcompanhada(object):
+    def __init__(
+        self,
+        txid: str,
+        tipo_cobranca: Literal["imediata", "com_vencimento"],
+        conta_corrente: Union[str, None],
+        status: Union[str, None],
+        expira_em: Union[float, None],
+        intervalo: float,
+    ):
+        self.txid = txid
+        self.tipo_cobranca = tipo_cobranca
+        self.conta_corrente = conta_corrente
+        self.status = status
+        self.expira_em = expira_em
+        self.intervalo = intervalo
+        self.proxima_consulta = 0.0
+
+
+def _parse_data_hora(valor: str) -> datetime.datetime:
+    data_hora = datetime.datetime.fromisoformat(valor.replace("Z", "+00:00"))
+    if data_hora.tzinfo is None:
+        data_hora = data_hora.replace(tzinfo=datetime.timezone.utc)
+    return data_hora
+
+
+def _calcular_expiracao(
+    calendario: Union[dict, None],
+) -> Union[datetime.datetime, None]:
+    # Cobrança imediata: criacao + expiracao (segundos).
+    # Cobrança com vencimento: dataDeVencimento + validadeAposVencimento (dias corridos),
+    # até o fim do dia no horário de Brasília.
+    if not calendario:
+        return None
+    try:
+        if "expiracao" in calendario and "criacao" in calendario:
+            return _parse_data_hora(calendario["criacao"]) + datetime.timedelta(
+                seconds=int(calendario["expiracao"])
+            )
+        if "dataDeVencimento" in calendario:
+            vencimento = datetime.date.fromisoformat(calendario["dataDeVencimento"])
+            validade = int(calendario.get("validadeAposVencimento", 30))
+            return datetime.datetime.combine(
+                vencimento + datetime.timedelta(days=validade + 1),
+                datetime.time(),
+                tzinfo=FUSO_BRASILIA,
+            )
+    except (TypeError, ValueError):
+        logger.debug(
+            f"Não foi possível calcular a expiração do calendário {calendario}"
+        )
+    return None
+
+
+class MonitorCobrancas(object):
+    """
+    Acompanha o status de muitas cobranças PIX pendentes, consultando a API de forma
+    adaptativa.
+
+    As cobranças ficam em um heap ordenado pelo horário da próxima consulta. Cada
+    consulta sem mudança de status multiplica o intervalo daquela cobrança por
+    `fator_backoff` (até `intervalo_maximo`), então cobranças paradas em ATIVA gastam
+    cada vez menos requisições. Cobranças finalizadas ou confirmadas por webhook
+    deixam de ser consultadas. Quando o `calendario` indica a expiração, a cobrança
+    é consultada uma última vez nesse momento, e o evento EXPIRADA só é emitido se a
+    API ainda não indicar um status final (um pagamento de última hora é reportado
+    como CONCLUIDA).
+
+    Parâmetros:
+    - cliente (InterClient): Cliente autenticado usado nas consultas.
+    - intervalo_inicial (float): Segundos até a primeira reconsulta. Padrão: 5.
+    - intervalo_maximo (float): Intervalo máximo entre consultas. Padrão: 600.
+    - fator_backoff (float): Multiplicador do intervalo sem mudanças. Padrão: 2.
+    - requisicoes_por_minuto (int): Limite de consultas por minuto. Padrão: 60.
+    - max_workers (int): Consultas simultâneas em cada ciclo. Padrão: 4.
+    - ao_mudar_status (callable | None): Chamado com um `EventoStatus` a cada
+    mudança de status.
+    """
+
+    def __init__(
+        self,
+        cliente,
+        intervalo_inicial: float = 5,
+        intervalo_maximo: float = 600,
+        fator_backoff: float = 2,
+        requisicoes_por_minuto: int = 60,
+        max_workers: int = 4,
+        ao_mudar_status: Union[Callable[[EventoStatus], None], None] = None,
+        relogio: Callable[[], float] = time.monotonic,
+    ):
+        self.cliente = cliente
+        self.intervalo_inicial = intervalo_inicial
+        self.intervalo_maximo = intervalo_maximo
+        self.fator_backoff = fator_backoff
+        self.requisicoes_por_minuto = requisicoes_por_minuto
+        self.max_workers = max_workers
+        self.ao_mudar_status = ao_mudar_status
+        self.relogio = relogio
+        self.__cobrancas: Dict[str, _CobrancaAcompanhada] = {}
+        self.__heap: list = []
+        self.__sequencia = itertools.count()
+        self.__lock = threading.RLock()
+        self.__tokens = float(requisicoes_por_minuto)
+        self.__ultima_recarga = relogio()
+
+    def __len__(self):
+        return len(self.__cobrancas)
+
+    def __contains__(self, txid: str):
+        return txid in self.__cobrancas
+
+    def acompanhar(
+        self,
+        txid: str,
+        tipo_cobranca: Literal["imediata", "com_vencimento"] = "imediata",
+        conta_corrente: Union[str, None] = None,
+        calendario: Union[dict, None] = None,
+        status: Union[str, None] = "ATIVA",
+    ):
+        expiracao = _calcular_expiracao(calendario)
+        expira_em = None
+        if expiracao:
+            agora = datetime.datetime.now(datetime.timezone.utc)
+            expira_em = self.relogio() + (expiracao - agora).total_seconds()
+
+        cobranca = _CobrancaAcompanhada(
+            txid,
+            tipo_cobranca,
+            conta_corrente,
+            status,
+            expira_em,
+            self.intervalo_inicial,
+        )
+        with self.__lock:
+            self.__cobrancas[txid] = cobranca
+            self.__agendar(cobranca, self.intervalo_inicial)
+
+    def acompanhar_cobranca(
+        self, cobranca: dict, conta_corrente: Union[str, None] = None
+    ):
+        """
+        Acompanha uma cobrança retornada por `criar_cobranca_pix`.
+        """
+        calendario = cobranca.get("calendario", {})
+        self.acompanhar(
+            cobranca["txid"],
+            "com_vencimento" if "dataDeVencimento" in calendario else "imediata",
+            conta_corrente=conta_corrente,
+            calendario=calendario,
+            status=cobranca.get("status", "ATIVA"),
+        )
+
+    def confirmar(self, txid: str, status: str = "CONCLUIDA", cobranca=None):
+        """
+        Marca a cobrança como finalizada (por exemplo, ao receber o webhook) e para de
+        consultá-la.
+        """
+        with self.__lock:
+            acompanhada = self.__cobrancas.pop(txid, None)
+        if acompanhada and acompanhada.status != status:
+            self.__emitir(EventoStatus(txid, acompanhada.status, status, cobranca))
+
+    def processar_webhook(self, corpo: dict):
+        """
+        Confirma as cobranças dos PIX recebidos no corpo de um webhook de PIX.
+        """
+        for pix in corpo.get("pix", []):
+            if pix.get("txid"):
+                self.confirmar(pix["txid"], cobranca=pix)
+
+    def executar_ciclo(self) -> List[EventoStatus]:
+        """
+        Consulta as cobranças cuja próxima consulta já venceu, respeitando o rate
+        limit, e retorna os eventos de mudança de status.
+        """
+        a_consultar = self.__retirar_devidas()
+        eventos = []
+        if a_consultar:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                resultados = list(executor.map(self.__consultar, a_consultar))
+            for cobranca, resultado in zip(a_consultar, resultados):
+                evento = self.__processar_resultado(cobranca, resultado)
+                if evento:
+                    eventos.append(evento)
+
+        for evento in eventos:
+            self.__emitir(evento)
+        return eventos
+
+    def executar(self, parar: Union[threading.Event, None] = None):
+        """
+        Executa ciclos até não haver mais cobranças acompanhadas ou até `parar` ser
+        sinalizado.
+        """
+        parar = parar or threading.Event()
+        while self.__cobrancas and not parar.is_set():
+            self.executar_ciclo()
+            parar.wait(self.__segundos_ate_proxima())
+
+    def __agendar(self, cobranca: _CobrancaAcompanhada, atraso: float):
+        agora = self.relogio()
+        # A última consulta antes da expiração é feita no momento em que ela ocorre.
+        # Depois dela (se a consulta final falhar), o back-off continua normal.
+        if cobranca.expira_em is not None and agora < cobranca.expira_em:
+            atraso = min(atraso, cobranca.expira_em - agora)
+        cobranca.proxima_consulta = agora + atraso
+        heapq.heappush(
+            self.__heap,
+            (cobranca.proxima_consulta, next(self.__sequencia), cobranca),
+        )
+
+    def __retirar_devidas(self) -> List[_CobrancaAcompanhada]:
+        agora = self.relogio()
+        self.__recarregar_tokens(agora)
+        a_consultar = []
+        with self.__lock:
+            while self.__heap and self.__heap[0][0] <= agora:
+                horario, _, cobranca = self.__heap[0]
+                # Entradas antigas (cobrança confirmada ou reagendada) são descartadas.
+                if (
+                    self.__cobrancas.get(cobranca.txid) is not cobranca
+                    or horario != cobranca.proxima_consulta
+                ):
+                    heapq.heappop(self.__heap)
+                    continue
+                if self.__tokens < 1:
+                    break
+                self.__tokens -= 1
+                a_consultar.append(cobranca)
+                heapq.heappop(self.__heap)
+        return a_consultar
+
+    def __recarregar_tokens(self, agora: float):
+        decorrido = agora - self.__ultima_recarga
+        self.__ultima_recarga = agora
+        self.__tokens = min(
+            float(self.requisicoes_por_minuto),
+            self.__tokens + decorrido * self.requisicoes_por_minuto / 60,
+        )
+
+    def __segundos_ate_proxima(self) -> float:
+        with self.__lock:
+            if not self.__heap:
+                return self.intervalo_inicial
+            espera = self.__heap[0][0] - self.relogio()
+        if self.__tokens < 1:
+            espera = max(espera, (1 - self.__tokens) * 60 / self.requisicoes_por_minuto)
+        return max(espera, 0)
+
+    def __expirou(self, cobranca: _CobrancaAcompanhada) -> bool:
+        return cobranca.expira_em is not None and self.relogio() >= cobranca.expira_em
+
+    def __consultar(self, cobranca: _CobrancaAcompanhada):
+        try:
+            return self.cliente.consultar_cobranca_pix_por_txid(
+                cobranca.tipo_cobranca,
+                cobranca.txid,
+                conta_corrente=cobranca.conta_corrente,
+            )
+        except Exception as e:
+            # Qualquer erro (inclusive de rede) só reagenda esta cobrança, para que as
+            # demais do ciclo continuem sendo processadas.
+            return e
+
+    def __processar_resultado(
+        self, cobranca: _CobrancaAcompanhada, resultado
+    ) -> Union[EventoStatus, None]:
+        with self.__lock:
+            # A cobrança pode ter sido confirmada por webhook durante a consulta.
+            if self.__cobrancas.get(cobranca.txid) is not cobranca:
+                return None
+
+            if isinstance(resultado, Exception):
+                logger.debug(
+                    f"Erro ao consultar a cobrança {cobranca.txid}: {resultado}"
+                )
+                if isinstance(resultado, RateLimitError):
+                    self.__tokens = min(self.__tokens, 0)
+                self.__aumentar_intervalo(cobranca)
+                self.__agendar(cobranca, cobranca.intervalo)
+                return None
+
+            status_novo = resultado.get("status")
+            status_anterior = cobranca.status
+            # Consulta feita na expiração (ou depois): se a API ainda não indicar um
+            # status final, a cobrança expirou.
+            if status_novo not in STATUS_FINAIS and self.__expirou(cobranca):
+                status_novo = "EXPIRADA"
+            if status_novo in STATUS_FINAIS:
+                self.__cobrancas.pop(cobranca.txid, None)
+            elif status_novo != status_anterior:
+                cobranca.intervalo = self.intervalo_inicial
+                self.__agendar(cobranca, cobranca.intervalo)
+            else:
+                self.__aumentar_intervalo(cobranca)
+                self.__agendar(cobranca, cobranca.intervalo)
+            cobranca.status = status_novo
+
+        if status_novo != status_anterior:
+            return EventoStatus(cobranca.txid, status_anterior, status_novo, resultado)
+        return None
+
+    def __aumentar_intervalo(self, cobranca: _CobrancaAcompanhada):
+        cobranca.intervalo = min(
+            cobranca.intervalo * self.fator_backoff, self.intervalo_maximo
+        )
+
+    def __emitir(self, evento: EventoStatus):
+        logger.debug(
+            f"Cobrança {evento.txid}: {evento.status_anterior} -> {evento.status_novo}"
+        )
+        if self.ao_mudar_status:
+            self.ao_mudar_status(evento)
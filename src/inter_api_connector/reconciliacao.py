@@ -0,0 +1,219 @@
+import decimal
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Literal, Union
+
+logger = logging.getLogger(__name__)
+
+StatusConciliacao = Literal[
+    "PENDENTE", "CONCILIADA", "VALOR_DIVERGENTE", "PAGAMENTO_DUPLICADO"
+]
+
+
+# Sinal de cada componente do valor de um PIX de cobrança com vencimento.
+_SINAIS_COMPONENTES = {"juros": 1, "multa": 1, "desconto": -1, "abatimento": -1}
+
+
+class ConciliadorPix(object):
+    """
+    Concilia, em memória, as cobranças criadas com `criar_cobranca_pix` com os PIX
+    recebidos (de `consultar_cobrancas_pix_recebidas` ou dos webhooks).
+
+    As cobranças são indexadas pelo txid e os PIX pelo endToEndId e pelo txid, então
+    cada cobrança ou PIX adicionado é conciliado em O(1), em uma única passada, e os
+    dados podem ser adicionados incrementalmente, em qualquer ordem.
+
+    Em cobranças com vencimento (cobv), o valor pago inclui juros e multa e desconta
+    desconto e abatimento. Quando o PIX traz os `componentesValor`, o valor original
+    é comparado com o da cobrança e o valor pago com a soma dos componentes. Sem os
+    componentes, o valor pago é comparado apenas com o valor original.
+
+    Parâmetros:
+    - tolerancia (Decimal | str | int | float): Diferença máxima aceita entre o valor
+    da cobrança e o valor pago. Padrão: 0.
+    """
+
+    def __init__(self, tolerancia: Union[decimal.Decimal, str, int, float] = 0):
+        self.tolerancia = decimal.Decimal(str(tolerancia))
+        # txid -> cobrança
+        self.cobrancas: Dict[str, dict] = {}
+        # endToEndId -> pix
+        self.pix: Dict[str, dict] = {}
+        # txid -> endToEndIds dos PIX recebidos para aquele txid
+        self.__pix_por_txid: Dict[str, List[str]] = defaultdict(list)
+        # txid -> status da cobrança
+        self.__status: Dict[str, StatusConciliacao] = {}
+        # status -> txids, para consultar os resultados sem percorrer tudo
+        self.__txids_por_status: Dict[str, set] = defaultdict(set)
+        # endToEndIds de PIX sem txid ou cujo txid não tem cobrança conhecida
+        self.__pix_orfaos: set = set()
+        self.eventos_repetidos = 0
+
+    def adicionar_cobranca(self, cobranca: dict) -> StatusConciliacao:
+        """
+        Adiciona ou atualiza uma cobrança (resposta de `criar_cobranca_pix`) e retorna
+        o status da conciliação dela.
+        """
+        txid = cobranca.get("txid") if isinstance(cobranca, dict) else None
+        if not txid:
+            raise ValueError('A cobrança deve ser um dict contendo o "txid".')
+
+        self.cobrancas[txid] = cobranca
+        for e2eid in self.__pix_por_txid.get(txid, ()):
+            self.__pix_orfaos.discard(e2eid)
+        return self.__atualizar_status(txid)
+
+    def adicionar_cobrancas(self, cobrancas: Iterable[dict]):
+        for cobranca in cobrancas:
+            self.adicionar_cobranca(cobranca)
+
+    def adicionar_pix(self, pix: dict) -> Union[StatusConciliacao, None]:
+        """
+        Adiciona um PIX recebido e retorna o status da cobrança correspondente, ou
+        None se o PIX não tiver uma cobrança conhecida (órfão).
+
+        O mesmo PIX (mesmo endToEndId) pode chegar mais de uma vez, pela consulta e
+        pelo webhook, por exemplo. As repetições são ignoradas e contadas em
+        `eventos_repetidos`.
+        """
+        e2eid = pix.get("endToEndId") if isinstance(pix, dict) else None
+        if not e2eid:
+            raise ValueError('O PIX deve ser um dict contendo o "endToEndId".')
+
+        txid = pix.get("txid")
+        if e2eid in self.pix:
+            self.eventos_repetidos += 1
+            self.pix[e2eid] = pix
+            return self.__status.get(txid) if txid else None
+
+        self.pix[e2eid] = pix
+        if not txid:
+            self.__pix_orfaos.add(e2eid)
+            return None
+
+        self.__pix_por_txid[txid].append(e2eid)
+        if txid not in self.cobrancas:
+            self.__pix_orfaos.add(e2eid)
+            return None
+        return self.__atualizar_status(txid)
+
+    def adicionar_pix_recebidos(self, pix: Union[dict, Iterable[dict]]):
+        """
+        Adiciona vários PIX recebidos. Aceita tanto um iterável de PIX quanto a
+        resposta de `consultar_cobrancas_pix_recebidas` ou o corpo de um webhook
+        (dicts com a lista em "pix").
+        """
+        if isinstance(pix, dict):
+            pix = pix.get("pix", [])
+        for item in pix:
+            self.adicionar_pix(item)
+
+    def status(self, txid: str) -> Union[StatusConciliacao, None]:
+        return self.__status.get(txid)
+
+    def txids(self, status: StatusConciliacao) -> List[str]:
+        return list(self.__txids_por_status.get(status, ()))
+
+    @property
+    def conciliadas(self) -> List[str]:
+        return self.txids("CONCILIADA")
+
+    @property
+    def pendentes(self) -> List[str]:
+        return self.txids("PENDENTE")
+
+    @property
+    def divergencias_valor(self) -> List[str]:
+        return self.txids("VALOR_DIVERGENTE")
+
+    @property
+    def duplicados(self) -> List[str]:
+        return self.txids("PAGAMENTO_DUPLICADO")
+
+    @property
+    def pix_orfaos(self) -> List[dict]:
+        return [self.pix[e2eid] for e2eid in self.__pix_orfaos]
+
+    def pix_da_cobranca(self, txid: str) -> List[dict]:
+        return [self.pix[e2eid] for e2eid in self.__pix_por_txid.get(txid, ())]
+
+    def resumo(self) -> dict:
+        resumo = {
+            status: len(self.__txids_por_status.get(status, ()))
+            for status in (
+                "PENDENTE",
+                "CONCILIADA",
+                "VALOR_DIVERGENTE",
+                "PAGAMENTO_DUPLICADO",
+            )
+        }
+        resumo["PIX_ORFAO"] = len(self.__pix_orfaos)
+        resumo["EVENTOS_REPETIDOS"] = self.eventos_repetidos
+        return resumo
+
+    def __atualizar_status(self, txid: str) -> StatusConciliacao:
+        novo_status = self.__calcular_status(txid)
+        status_anterior = self.__status.get(txid)
+        if status_anterior != novo_status:
+            if status_anterior:
+                self.__txids_por_status[status_anterior].discard(txid)
+            self.__txids_por_status[novo_status].add(txid)
+            self.__status[txid] = novo_status
+            logger.debug(f"Cobrança {txid}: {status_anterior} -> {novo_status}")
+        return novo_status
+
+    def __calcular_status(self, txid: str) -> StatusConciliacao:
+        e2eids = self.__pix_por_txid.get(txid, ())
+        if not e2eids:
+            return "PENDENTE"
+        if len(e2eids) > 1:
+            return "PAGAMENTO_DUPLICADO"
+
+        pix = self.pix[e2eids[0]]
+        valor_original = self.__decimal(self.cobrancas[txid].get("valor", {}))
+        valor_pago = self.__decimal(pix.get("valor"))
+        valor_esperado = valor_original
+        componentes = pix.get("componentesValor")
+        if isinstance(componentes, dict) and valor_original is not None:
+            # Cobrança com vencimento: o original dos componentes deve ser o da
+            # cobrança, e o valor pago, a soma dos componentes.
+            original = self.__componente(componentes, "original")
+            if original is None or not self.__dentro_da_tolerancia(
+                original, valor_original
+            ):
+                return "VALOR_DIVERGENTE"
+            valor_esperado = original
+            for nome, sinal in _SINAIS_COMPONENTES.items():
+                valor = self.__componente(componentes, nome)
+                if valor is not None:
+                    valor_esperado += sinal * valor
+        if (
+            valor_esperado is None
+            or valor_pago is None
+            or not self.__dentro_da_tolerancia(valor_esperado, valor_pago)
+        ):
+            return "VALOR_DIVERGENTE"
+        return "CONCILIADA"
+
+    def __dentro_da_tolerancia(
+        self, valor: decimal.Decimal, outro: decimal.Decimal
+    ) -> bool:
+        return abs(valor - outro) <= self.tolerancia
+
+    def __componente(
+        self, componentes: dict, nome: str
+    ) -> Union[decimal.Decimal, None]:
+        # Os componentes vêm no formato {"juros": {"valor": "1.00"}}.
+        componente = componentes.get(nome)
+        if not isinstance(componente, dict) or "valor" not in componente:
+            return None
+        return self.__decimal(componente["valor"])
+
+    def __decimal(self, valor) -> Union[decimal.Decimal, None]:
+        # O valor da cobrança vem em {"original": "10.00"}, o do PIX vem direto.
+        if isinstance(valor, dict):
+            valor = valor.get("original")
+        try:
+            return decimal.Decimal(str(valor))
+        except (decimal.InvalidOperation, TypeError):
+            return None
@@ -0,0 +1,380 @@
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import wait
+from typing import Callable, Dict, Literal, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from .error import CircuitBreakerError, Error
+
+logger = logging.getLogger(__name__)
+
+# Códigos HTTP que indicam uma falha do lado do Inter.
+STATUS_FALHA = (500, 502, 503, 504)
+
+# Camadas vivas, cujos locks são recriados após um fork.
+_instancias = weakref.WeakSet()
+
+
+def _reiniciar_apos_fork():
+    # Um lock herdado pode ter sido copiado no estado adquirido por uma thread que não
+    # existe no processo filho.
+    for instancia in list(_instancias):
+        instancia._reiniciar_apos_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reiniciar_apos_fork)
+
+
+def familia_endpoint(url: str) -> str:
+    """
+    Retorna a família do endpoint, os dois primeiros segmentos do caminho da URL
+    (por exemplo, "pix/v2" ou "banking/v2").
+    """
+    return "/".join(urlsplit(url).path.strip("/").split("/")[:2])
+
+
+class CircuitBreaker(object):
+    """
+    Circuit breaker de uma família de endpoints.
+
+    Depois de `limite_falhas` falhas seguidas o circuito abre e as requisições falham
+    imediatamente com `CircuitBreakerError`. Após `tempo_abertura` segundos uma única
+    requisição de teste é liberada: se ela funcionar o circuito fecha, senão volta a
+    abrir.
+    """
+
+    def __init__(
+        self,
+        limite_falhas: int = 5,
+        tempo_abertura: float = 30,
+        relogio: Callable[[], float] = time.monotonic,
+    ):
+        self.limite_falhas = limite_falhas
+        self.tempo_abertura = tempo_abertura
+        self.relogio = relogio
+        self.estado: Literal["FECHADO", "ABERTO", "SEMI_ABERTO"] = "FECHADO"
+        self.falhas = 0
+        self.__aberto_em = 0.0
+        self.__lock = threading.Lock()
+
+    def permitir(self) -> bool:
+        with self.__lock:
+            if self.estado == "FECHADO":
+                return True
+            if (
+                self.estado == "ABERTO"
+                and self.relogio() - self.__aberto_em >= self.tempo_abertura
+            ):
+                self.estado = "SEMI_ABERTO"
+                return True
+            return False
+
+    def registrar_sucesso(self):
+        with self.__lock:
+            self.estado = "FECHADO"
+            self.falhas = 0
+
+    def registrar_falha(self):
+        with self.__lock:
+            self.falhas += 1
+            if self.estado == "SEMI_ABERTO" or self.falhas >= self.limite_falhas:
+                self.estado = "ABERTO"
+                self.__aberto_em = self.relogio()
+
+    def _reiniciar_apos_fork(self):
+        self.__lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_CircuitBreaker__lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+
+class TransporteResiliente(object):
+    """
+    Camada de transporte (veja o parâmetro `transporte` do `API`) que protege o
+    cliente durante instabilidades do Inter.
+
+    - Circuit breaker por família de endpoints: respostas 5xx e erros de rede seguidos
+    abrem o circuito daquela família, e as chamadas seguintes falham imediatamente em
+    vez de prender as threads.
+    - Hedging opcional de GETs: se a resposta demorar mais que o p95 recente da
+    família, uma requisição duplicada é enviada e a primeira resposta é usada.
+
+    Parâmetros:
+    - limite_falhas (int): Falhas seguidas que abrem o circuito. Padrão: 5.
+    - tempo_abertura (float): Segundos até testar o circuito novamente. Padrão: 30.
+    - timeout (float | None): Timeout padrão das requisições, em segundos. Sem ele,
+    uma requisição travada nunca conta como falha. Padrão: 30.
+    - hedge (bool): Habilita o hedging dos GETs. Padrão: False.
+    - atraso_hedge_inicial (float): Atraso do hedge até haver amostras suficientes
+    para calcular o p95. Padrão: 1.
+    - max_workers_hedge (int): Threads usadas pelas requisições duplicadas. Padrão: 16.
+    - amostras_latencia (int): Quantidade de requisições recentes usadas no p95 e no
+    limite de hedges. Padrão: 200.
+    - fracao_maxima_hedge (float): Fração máxima das requisições recentes que pode
+    ser duplicada, para que o hedging não multiplique a carga justamente quando o
+    Inter está lento. Padrão: 0.05.
+
+    O hedge só é enviado com o circuito da família fechado. O estado dos circuitos e
+    as latências não são serializados com pickle nem compartilhados entre processos.
+    """
+
+    def __init__(
+        self,
+        limite_falhas: int = 5,
+        tempo_abertura: float = 30,
+        timeout: Union[float, None] = 30,
+        hedge: bool = False,
+        atraso_hedge_inicial: float = 1,
+        max_workers_hedge: int = 16,
+        amostras_latencia: int = 200,
+        fracao_maxima_hedge: float = 0.05,
+    ):
+        self.limite_falhas = limite_falhas
+        self.tempo_abertura = tempo_abertura
+        self.timeout = timeout
+        self.hedge = hedge
+        self.atraso_hedge_inicial = atraso_hedge_inicial
+        self.max_workers_hedge = max_workers_hedge
+        self.amostras_latencia = amostras_latencia
+        self.fracao_maxima_hedge = fracao_maxima_hedge
+        self.__circuitos: Dict[str, CircuitBreaker] = {}
+        self.__latencias: Dict[str, deque] = {}
+        # Se cada uma das requisições recentes elegíveis ao hedge foi duplicada.
+        self.__janela_hedge = deque(maxlen=amostras_latencia)
+        self.__hedges_na_janela = 0
+        self.__lock = threading.Lock()
+        _instancias.add(self)
+
+    def envolver(self, sessao):
+        return _SessaoResiliente(sessao, self)
+
+    def circuito(self, familia: str) -> CircuitBreaker:
+        with self.__lock:
+            if familia not in self.__circuitos:
+                self.__circuitos[familia] = CircuitBreaker(
+                    self.limite_falhas, self.tempo_abertura
+                )
+            return self.__circuitos[familia]
+
+    def registrar_latencia(self, familia: str, segundos: float):
+        with self.__lock:
+            if familia not in self.__latencias:
+                self.__latencias[familia] = deque(maxlen=self.amostras_latencia)
+            self.__latencias[familia].append(segundos)
+
+    def atraso_hedge(self, familia: str) -> float:
+        with self.__lock:
+            latencias = sorted(self.__latencias.get(familia, ()))
+        # Com poucas amostras o p95 não é confiável.
+        if len(latencias) < 20:
+            return self.atraso_hedge_inicial
+        return latencias[math.ceil(0.95 * len(latencias)) - 1]
+
+    def reservar_hedge(self, necessario: bool) -> bool:
+        """
+        Registra uma requisição elegível ao hedge e retorna se a duplicata pode ser
+        enviada sem ultrapassar `fracao_maxima_hedge` das requisições recentes.
+        """
+        with self.__lock:
+            janela = self.__janela_hedge
+            permitido = necessario and (
+                self.__hedges_na_janela + 1
+                <= self.fracao_maxima_hedge * (len(janela) + 1)
+            )
+            if len(janela) == janela.maxlen:
+                self.__hedges_na_janela -= janela[0]
+            janela.append(permitido)
+            self.__hedges_na_janela += permitido
+            return permitido
+
+    def _reiniciar_apos_fork(self):
+        self.__lock = threading.Lock()
+        for circuito in self.__circuitos.values():
+            circuito._reiniciar_apos_fork()
+
+    def __getstate__(self):
+        return {
+            "limite_falhas": self.limite_falhas,
+            "tempo_abertura": self.tempo_abertura,
+            "timeout": self.timeout,
+            "hedge": self.hedge,
+            "atraso_hedge_inicial": self.atraso_hedge_inicial,
+            "max_workers_hedge": self.max_workers_hedge,
+            "amostras_latencia": self.amostras_latencia,
+            "fracao_maxima_hedge": self.fracao_maxima_hedge,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+class _SessaoResiliente(object):
+    def __init__(self, sessao, camada: TransporteResiliente):
+        self.sessao = sessao
+        self.camada = camada
+        # O executor pertence à sessão, que é recriada após um fork.
+        self.__executor = None
+        self.__lock = threading.Lock()
+
+    @property
+    def headers(self):
+        return self.sessao.headers
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        familia = familia_endpoint(url)
+        circuito = self.camada.circuito(familia)
+        if not circuito.permitir():
+            raise CircuitBreakerError(
+                f'O circuito de "{familia}" está aberto após falhas seguidas do '
+                "Inter. Tente novamente em alguns instantes."
+            )
+        if self.camada.timeout is not None:
+            kwargs.setdefault("timeout", self.camada.timeout)
+
+        if (
+            self.camada.hedge
+            and method.upper() == "GET"
+            and not kwargs.get("stream")
+            and circuito.estado == "FECHADO"
+        ):
+            return self.__request_hedged(familia, circuito, method, url, kwargs)
+        return self.__executar(familia, circuito, method, url, kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, data=None, **kwargs) -> requests.Response:
+        return self.request("POST", url, data=data, **kwargs)
+
+    def put(self, url: str, data=None, **kwargs) -> requests.Response:
+        return self.request("PUT", url, data=data, **kwargs)
+
+    def patch(self, url: str, data=None, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, data=data, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+        self.sessao.close()
+
+    def __executar(
+        self,
+        familia: str,
+        circuito: CircuitBreaker,
+        method: str,
+        url: str,
+        kwargs: dict,
+    ) -> requests.Response:
+        inicio = time.monotonic()
+        try:
+            resposta = self.sessao.request(method, url, **kwargs)
+        except Error:
+            # Erros do próprio cliente (como a cassete sem resposta) não indicam
+            # falha do Inter.
+            circuito.registrar_sucesso()
+            raise
+        except Exception:
+            circuito.registrar_falha()
+            raise
+        if resposta.status_code in STATUS_FALHA:
+            circuito.registrar_falha()
+        else:
+            circuito.registrar_sucesso()
+            self.camada.registrar_latencia(familia, time.monotonic() - inicio)
+        return resposta
+
+    def __request_hedged(
+        self,
+        familia: str,
+        circuito: CircuitBreaker,
+        method: str,
+        url: str,
+        kwargs: dict,
+    ) -> requests.Response:
+        args = (familia, circuito, method, url, kwargs)
+        # A requisição principal roda em uma thread própria, e não no pool do hedge:
+        # na fila do pool, o tempo de espera contaria como latência e dispararia
+        # hedges desnecessários. O pool é usado apenas para as duplicatas.
+        primaria = _executar_em_thread(self.__executar, *args)
+        try:
+            resposta = primaria.result(timeout=self.camada.atraso_hedge(familia))
+        except FuturesTimeoutError:
+            pass
+        else:
+            self.camada.reservar_hedge(False)
+            return resposta
+
+        # Sem hedge se o circuito deixou de estar fechado durante a espera ou se o
+        # limite de duplicatas foi atingido.
+        if not self.camada.reservar_hedge(circuito.estado == "FECHADO"):
+            return primaria.result()
+
+        logger.debug(f"Enviando requisição duplicada (hedge) para {method} {url}")
+        pendentes = {primaria, self.__get_executor().submit(self.__executar, *args)}
+        erro: Union[Exception, None] = None
+        resposta_falha: Union[requests.Response, None] = None
+        while pendentes:
+            concluidas, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                try:
+                    resposta = futuro.result()
+                except Exception as e:
+                    erro = e
+                    continue
+                if resposta.status_code in STATUS_FALHA:
+                    resposta_falha = resposta
+                    continue
+                # A requisição que perdeu a corrida é descartada quando terminar.
+                for perdedora in pendentes:
+                    perdedora.add_done_callback(_fechar_resposta)
+                return resposta
+        if resposta_falha is not None:
+            return resposta_falha
+        raise erro
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.camada.max_workers_hedge
+                )
+            return self.__executor
+
+
+def _executar_em_thread(funcao: Callable, *args) -> Future:
+    futuro = Future()
+
+    def executar():
+        if not futuro.set_running_or_notify_cancel():
+            return
+        try:
+            futuro.set_result(funcao(*args))
+        except BaseException as e:
+            futuro.set_exception(e)
+
+    threading.Thread(target=executar, daemon=True).start()
+    return futuro
+
+
+def _fechar_resposta(futuro):
+    if not futuro.cancelled() and futuro.exception() is None:
+        futuro.result().close()
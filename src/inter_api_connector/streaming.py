@@ -0,0 +1,120 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Union
+
+_ESPACOS = re.compile(r"[ \t\n\r]*")
+_CONTINUACAO_NUMERO = re.compile(r"[0-9.eE+-]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Buffer(object):
+    # Texto recebido e ainda não processado, alimentado sob demanda pelos blocos.
+    def __init__(self, blocos: Iterable[Union[bytes, str]]):
+        self.blocos = iter(blocos)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.texto = ""
+        self.posicao = 0
+        self.fim = False
+
+    def carregar(self) -> bool:
+        if self.fim:
+            return False
+        # Descarta o que já foi processado, para a memória não crescer.
+        self.texto = self.texto[self.posicao :]
+        self.posicao = 0
+        for bloco in self.blocos:
+            if isinstance(bloco, bytes):
+                bloco = self.decoder.decode(bloco)
+            if bloco:
+                self.texto += bloco
+                return True
+        self.texto += self.decoder.decode(b"", final=True)
+        self.fim = True
+        return True
+
+    def proximo_caractere(self) -> str:
+        # Pula os espaços e retorna o próximo caractere, sem consumi-lo.
+        while True:
+            self.posicao = _ESPACOS.match(self.texto, self.posicao).end()
+            if self.posicao < len(self.texto):
+                return self.texto[self.posicao]
+            if not self.carregar():
+                raise ValueError("O JSON terminou antes do esperado.")
+
+    def consumir(self, esperado: str):
+        if self.proximo_caractere() != esperado:
+            raise ValueError(
+                f'Esperado "{esperado}" no JSON, encontrado '
+                f'"{self.texto[self.posicao]}" na posição {self.posicao}.'
+            )
+        self.posicao += 1
+
+    def ler_valor(self) -> Any:
+        self.proximo_caractere()
+        while True:
+            try:
+                valor, fim = _DECODER.raw_decode(self.texto, self.posicao)
+            except json.JSONDecodeError:
+                if not self.carregar():
+                    raise
+                continue
+            # Um número no fim do buffer pode estar incompleto: "12" de "123", ou "1"
+            # de "1.5" e "1e5", que chegam como "1." e "1e". Nesse caso o número é lido
+            # de novo com o próximo bloco.
+            if (
+                self.fim
+                or not isinstance(valor, (int, float))
+                or isinstance(valor, bool)
+                or _CONTINUACAO_NUMERO.match(self.texto, fim).end() < len(self.texto)
+            ):
+                self.posicao = fim
+                return valor
+            self.carregar()
+
+
+def iterar_itens_json(
+    blocos: Iterable[Union[bytes, str]],
+    chave: Union[str, None] = None,
+    outros: Union[dict, None] = None,
+) -> Iterator[Any]:
+    """
+    Lê um JSON de forma incremental, a partir de blocos de bytes (como os de
+    `response.iter_content`), e retorna um a um os itens da lista em `chave`, assim
+    que cada item termina de chegar.
+
+    Apenas o item atual fica na memória, então o consumo de memória não depende do
+    tamanho da lista.
+
+    Parâmetros:
+    - blocos (iterable): Blocos do corpo da resposta.
+    - chave (str | None): Chave da lista no objeto de primeiro nível. Com None, o
+    próprio JSON deve ser uma lista.
+    - outros (dict | None): Se fornecido, recebe os demais campos do objeto de
+    primeiro nível (paginação, parâmetros, etc.) lidos até o fim da lista.
+    """
+    buffer = _Buffer(blocos)
+
+    if chave is not None:
+        buffer.consumir("{")
+        while True:
+            if buffer.proximo_caractere() == "}":
+                return
+            nome = buffer.ler_valor()
+            buffer.consumir(":")
+            if nome == chave and buffer.proximo_caractere() == "[":
+                break
+            valor = buffer.ler_valor()
+            if outros is not None:
+                outros[nome] = valor
+            if buffer.proximo_caractere() == ",":
+                buffer.posicao += 1
+
+    buffer.consumir("[")
+    if buffer.proximo_caractere() == "]":
+        return
+    while True:
+        yield buffer.ler_valor()
+        if buffer.proximo_caractere() == "]":
+            return
+        buffer.consumir(",")
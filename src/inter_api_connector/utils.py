@@ -1,3 +1,27 @@
+import copy
+import itertools
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Tuple
+
+# Caches vivos, esvaziados após um fork.
+_caches = weakref.WeakSet()
+
+
+def _esvaziar_caches_apos_fork():
+    # Uma consulta em andamento no pai nunca termina no filho, então quem esperasse
+    # por ela ficaria bloqueado para sempre.
+    for cache in list(_caches):
+        cache._reiniciar_apos_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_esvaziar_caches_apos_fork)
+
+
 def mask_sensitive_data(value):
     """
     Esta função recebe um valor sensível, como uma senha ou informação confidencial,
@@ -14,3 +38,118 @@ def mask_sensitive_data(value):
     if isinstance(value, str) and len(value) > 1:
         return value[0] + "*" * (len(value) - 1)
     return value
+
+
+def executar_em_paralelo(
+    funcao: Callable[[Any], Any], itens: Iterable[Any], max_workers: int = 8
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Esta função executa `funcao` para cada item de `itens` em um pool de threads e
+    devolve os resultados à medida que ficam prontos.
+
+    No máximo `2 * max_workers` itens ficam pendentes ao mesmo tempo, então `itens`
+    pode ser um iterável muito grande (ou infinito) sem ser carregado na memória.
+
+    Parâmetros:
+    - funcao (callable): Função chamada com cada item.
+    - itens (iterable): Itens a serem processados.
+    - max_workers (int): Número de threads.
+
+    Retorna:
+    - iterator: Tuplas (item, resultado), na ordem em que terminarem. Se a chamada
+    falhar, o resultado é a exceção levantada, para que um erro em um item não
+    interrompa os demais.
+    """
+    itens = iter(itens)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pendentes = {
+            executor.submit(funcao, item): item
+            for item in itertools.islice(itens, 2 * max_workers)
+        }
+        while pendentes:
+            concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                item = pendentes.pop(futuro)
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    resultado = e
+                for proximo in itertools.islice(itens, 1):
+                    pendentes[executor.submit(funcao, proximo)] = proximo
+                yield item, resultado
+
+
+class CacheTTL(object):
+    """
+    Cache em memória com tempo de expiração (TTL), seguro para várias threads.
+
+    Chamadas simultâneas para a mesma chave ainda não cacheada fazem uma única
+    chamada a `funcao`; as demais esperam pelo resultado dela. Cada chamada recebe uma
+    cópia do valor, que pode ser alterada sem afetar o cache. Os valores expirados são
+    removidos a cada nova gravação.
+
+    Parâmetros:
+    - ttl (float): Segundos que cada valor fica no cache. Com 0 o cache é desativado.
+    - relogio (callable): Função que retorna o horário atual, em segundos.
+    """
+
+    def __init__(self, ttl: float = 0, relogio: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.relogio = relogio
+        self.__valores: Dict[Hashable, Tuple[float, Any]] = {}
+        self.__em_andamento: Dict[Hashable, Future] = {}
+        self.__lock = threading.Lock()
+        _caches.add(self)
+
+    def obter(self, chave: Hashable, funcao: Callable[[], Any]) -> Any:
+        if not self.ttl:
+            return funcao()
+
+        with self.__lock:
+            item = self.__valores.get(chave)
+            if item and item[0] > self.relogio():
+                return copy.deepcopy(item[1])
+            futuro = self.__em_andamento.get(chave)
+            responsavel = futuro is None
+            if responsavel:
+                futuro = self.__em_andamento[chave] = Future()
+
+        if not responsavel:
+            return copy.deepcopy(futuro.result())
+
+        try:
+            valor = funcao()
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        else:
+            futuro.set_result(valor)
+            with self.__lock:
+                agora = self.relogio()
+                for expirada in [
+                    k
+                    for k, (expira_em, _) in self.__valores.items()
+                    if expira_em <= agora
+                ]:
+                    del self.__valores[expirada]
+                self.__valores[chave] = (agora + self.ttl, valor)
+            return copy.deepcopy(valor)
+        finally:
+            with self.__lock:
+                self.__em_andamento.pop(chave, None)
+
+    def limpar(self):
+        with self.__lock:
+            self.__valores.clear()
+
+    def _reiniciar_apos_fork(self):
+        self.__valores = {}
+        self.__em_andamento = {}
+        self.__lock = threading.Lock()
+
+    def __getstate__(self):
+        # Os valores cacheados pertencem ao processo, apenas o TTL é serializado.
+        return {"ttl": self.ttl}
+
+    def __setstate__(self, state):
+        self.__init__(state["ttl"])
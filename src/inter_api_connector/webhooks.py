@@ -0,0 +1,159 @@
+import logging
+from typing import Iterable, List, Literal, NamedTuple, Union
+
+from .error import NotFoundError
+from .utils import executar_em_paralelo
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookDesejado(NamedTuple):
+    """
+    Configuração desejada de um webhook. Com `url` None, o webhook deve ser excluído.
+    """
+
+    conta_corrente: Union[str, None]
+    api: Literal["banking", "cobranca", "cobranca_com_pix", "pix"]
+    url: Union[str, None]
+    path_parameter: Union[str, None] = None
+
+
+class AcaoWebhook(NamedTuple):
+    webhook: WebhookDesejado
+    url_atual: Union[str, None]
+    acao: Literal["MANTER", "CRIAR", "EXCLUIR", "ERRO"]
+    erro: Union[Exception, None] = None
+
+
+class ReconciliadorWebhooks(object):
+    """
+    Reconcilia, de forma declarativa, os webhooks de várias contas correntes.
+
+    A configuração atual de cada webhook é lida em paralelo com
+    `obter_webhook_cadastrado` e comparada com a desejada. Só são feitas as chamadas
+    de `criar_webhook` e `excluir_webhook` necessárias, também em paralelo.
+
+    Uso:
+    >>> reconciliador = ReconciliadorWebhooks(cliente)
+    >>> plano = reconciliador.planejar(desejados)  # dry-run
+    >>> print(reconciliador.relatorio(plano))
+    >>> resultado = reconciliador.aplicar(plano)
+    """
+
+    def __init__(self, cliente, max_workers: int = 8):
+        self.cliente = cliente
+        self.max_workers = max_workers
+
+    def planejar(self, desejados: Iterable[WebhookDesejado]) -> List[AcaoWebhook]:
+        """
+        Lê os webhooks atuais e retorna as ações necessárias, sem alterar nada.
+
+        Entradas repetidas são consideradas uma única vez. Levanta `ValueError` se o
+        mesmo webhook (conta corrente, api e path_parameter) aparecer com URLs
+        diferentes.
+        """
+        desejados = self.__remover_duplicados(
+            WebhookDesejado(*webhook) for webhook in desejados
+        )
+        self.__autenticar()
+        atuais = dict(
+            executar_em_paralelo(self.__obter_url_atual, desejados, self.max_workers)
+        )
+        plano = []
+        for webhook in desejados:
+            url_atual = atuais[webhook]
+            if isinstance(url_atual, Exception):
+                plano.append(AcaoWebhook(webhook, None, "ERRO", url_atual))
+            elif url_atual == webhook.url:
+                plano.append(AcaoWebhook(webhook, url_atual, "MANTER"))
+            elif webhook.url is None:
+                plano.append(AcaoWebhook(webhook, url_atual, "EXCLUIR"))
+            else:
+                plano.append(AcaoWebhook(webhook, url_atual, "CRIAR"))
+        return plano
+
+    def aplicar(self, plano: Iterable[AcaoWebhook]) -> List[AcaoWebhook]:
+        """
+        Executa as ações de criação e exclusão do plano em paralelo e retorna o plano
+        com o erro de cada ação que falhou.
+        """
+        plano = list(plano)
+        pendentes = [acao for acao in plano if acao.acao in ("CRIAR", "EXCLUIR")]
+        if pendentes:
+            self.__autenticar()
+        resultados = dict(
+            executar_em_paralelo(self.__executar, pendentes, self.max_workers)
+        )
+        return [
+            (
+                acao._replace(erro=resultados[acao])
+                if isinstance(resultados.get(acao), Exception)
+                else acao
+            )
+            for acao in plano
+        ]
+
+    def reconciliar(
+        self, desejados: Iterable[WebhookDesejado], dry_run: bool = False
+    ) -> List[AcaoWebhook]:
+        plano = self.planejar(desejados)
+        if dry_run:
+            return plano
+        return self.aplicar(plano)
+
+    def relatorio(self, plano: Iterable[AcaoWebhook]) -> str:
+        linhas = []
+        for acao in plano:
+            webhook = acao.webhook
+            destino = f"{webhook.api}/{webhook.path_parameter or ''}".rstrip("/")
+            linha = (
+                f"{acao.acao:<7} conta {webhook.conta_corrente or '-'} {destino}: "
+                f"{acao.url_atual or '-'} -> {webhook.url or '-'}"
+            )
+            if acao.erro is not None:
+                linha += f" ({acao.erro})"
+            linhas.append(linha)
+        return "\n".join(linhas)
+
+    def __remover_duplicados(
+        self, desejados: Iterable[WebhookDesejado]
+    ) -> List[WebhookDesejado]:
+        unicos = {}
+        for webhook in desejados:
+            destino = (webhook.conta_corrente, webhook.api, webhook.path_parameter)
+            anterior = unicos.setdefault(destino, webhook)
+            if anterior.url != webhook.url:
+                raise ValueError(
+                    f"O webhook {webhook.api} da conta {webhook.conta_corrente or '-'} "
+                    f"(path_parameter: {webhook.path_parameter}) foi informado com URLs "
+                    f"diferentes: {anterior.url} e {webhook.url}"
+                )
+        return list(unicos.values())
+
+    def __autenticar(self):
+        # Autentica antes de disparar as threads, para que elas não tentem obter o
+        # token ao mesmo tempo.
+        if not self.cliente.is_autenticated:
+            self.cliente.autenticar()
+
+    def __obter_url_atual(self, webhook: WebhookDesejado) -> Union[str, None]:
+        try:
+            cadastrado = self.cliente.obter_webhook_cadastrado(
+                webhook.api, webhook.path_parameter, webhook.conta_corrente
+            )
+        except NotFoundError:
+            return None
+        return cadastrado.get("webhookUrl")
+
+    def __executar(self, acao: AcaoWebhook):
+        webhook = acao.webhook
+        logger.debug(
+            f"{acao.acao} webhook {webhook.api} da conta {webhook.conta_corrente}"
+        )
+        if acao.acao == "CRIAR":
+            return self.cliente.criar_webhook(
+                webhook.api, webhook.url, webhook.path_parameter, webhook.conta_corrente
+            )
+        return self.cliente.excluir_webhook(
+            webhook.api, webhook.path_parameter, webhook.conta_corrente
+        )
@@ -0,0 +1,139 @@
+import datetime
+import json
+import os
+import sys
+import threading
+from typing import NamedTuple
+
+import pytest
+import requests
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+# Permite rodar os testes sem instalar o pacote.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from inter_api_connector import InterClient  # noqa: E402
+
+
+class Relogio(object):
+    # Relógio controlado pelo teste, no lugar de `time.monotonic`.
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+    def avancar(self, segundos):
+        self.agora += segundos
+
+
+@pytest.fixture
+def relogio():
+    return Relogio()
+
+
+class Requisicao(NamedTuple):
+    numero: int
+    metodo: str
+    url: str
+    kwargs: dict
+
+
+class SessaoFalsa(object):
+    """
+    Substituto do `requests.Session`. Cada requisição é registrada em `requisicoes` e
+    respondida por `responder(requisicao)`, que retorna uma `requests.Response` ou os
+    dados do JSON da resposta.
+    """
+
+    def __init__(self, responder=None):
+        self.responder = responder or (lambda requisicao: {"url": requisicao.url})
+        self.headers = {}
+        self.requisicoes = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def resposta(dados=None, status_code=200):
+        resposta = requests.Response()
+        resposta.status_code = status_code
+        resposta.headers["Content-Type"] = "application/json"
+        resposta._content = json.dumps({} if dados is None else dados).encode()
+        resposta._content_consumed = True
+        return resposta
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            requisicao = Requisicao(len(self.requisicoes) + 1, method, url, kwargs)
+            self.requisicoes.append(requisicao)
+        resposta = self.responder(requisicao)
+        if not isinstance(resposta, requests.Response):
+            resposta = self.resposta(resposta)
+        return resposta
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request("POST", url, data=data, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request("PUT", url, data=data, **kwargs)
+
+    def patch(self, url, data=None, **kwargs):
+        return self.request("PATCH", url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sessao_falsa():
+    return SessaoFalsa
+
+
+@pytest.fixture(scope="session")
+def certificado():
+    # Certificado autoassinado e chave do cliente, como objetos do cryptography.
+    chave = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    nome = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "teste")])
+    certificado = (
+        x509.CertificateBuilder()
+        .subject_name(nome)
+        .issuer_name(nome)
+        .public_key(chave.public_key())
+        .serial_number(1)
+        .not_valid_before(datetime.datetime(2020, 1, 1))
+        .not_valid_after(datetime.datetime(2100, 1, 1))
+        .sign(chave, hashes.SHA256())
+    )
+    return certificado, chave
+
+
+@pytest.fixture(scope="session")
+def certificado_pem(certificado):
+    certificado, chave = certificado
+    return (
+        certificado.public_bytes(serialization.Encoding.PEM),
+        chave.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ),
+    )
+
+
+@pytest.fixture
+def cliente():
+    # Cliente já autenticado, para que os testes não precisem do endpoint de token.
+    cliente = InterClient(client_id="id", client_secret="secret", scope="boleto")
+    cliente.access_token = "token"
+    cliente.access_token_expiration = datetime.datetime.now() + datetime.timedelta(
+        hours=1
+    )
+    return cliente
@@ -0,0 +1,77 @@
+import os
+import pickle
+import threading
+import time
+
+import pytest
+
+from inter_api_connector import InterClient
+
+
+class CamadaContadora(object):
+    # Camada de transporte que conta as sessões criadas.
+    def __init__(self, atraso=0):
+        self.atraso = atraso
+        self.sessoes = []
+        self.lock = threading.Lock()
+
+    def envolver(self, sessao):
+        time.sleep(self.atraso)
+        with self.lock:
+            self.sessoes.append(sessao)
+        return sessao
+
+
+def test_cliente_serializado_com_certificado(certificado_pem):
+    certificado, chave = certificado_pem
+    cliente = InterClient(certificado, chave, "id", "secret", scope="pix.read")
+    cliente.access_token = "token"
+    sessao = cliente.session
+
+    copia = pickle.loads(pickle.dumps(cliente))
+    assert copia.cert[0] == cliente.cert[0]
+    assert copia.cert[1].private_numbers() == cliente.cert[1].private_numbers()
+    assert copia.access_token == "token"
+    assert copia.session is not sessao
+    assert copia.session.headers["Authorization"] == "Bearer token"
+
+
+def test_uma_sessao_para_acessos_simultaneos():
+    camada = CamadaContadora(atraso=0.05)
+    cliente = InterClient(client_id="id", client_secret="secret", transporte=camada)
+    barreira = threading.Barrier(8)
+    sessoes = []
+
+    def acessar():
+        barreira.wait()
+        sessoes.append(cliente.session)
+
+    threads = [threading.Thread(target=acessar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(camada.sessoes) == 1
+    assert all(sessao is sessoes[0] for sessao in sessoes)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requer os.fork")
+def test_processo_filho_recebe_sessao_nova(certificado_pem):
+    cliente = InterClient(*certificado_pem, "id", "secret")
+    sessao_pai = id(cliente.session)
+
+    leitura, escrita = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(leitura)
+            sessao_filho = cliente.session
+            nova = id(sessao_filho) != sessao_pai and sessao_filho is cliente.session
+            os.write(escrita, b"1" if nova else b"0")
+        finally:
+            os._exit(0)
+    os.close(escrita)
+    os.waitpid(pid, 0)
+    assert os.read(leitura, 1) == b"1"
+    os.close(leitura)
+    assert id(cliente.session) == sessao_pai
@@ -0,0 +1,75 @@
+import pytest
+
+from inter_api_connector.brcode import (
+    crc16,
+    gerar_brcode,
+    gerar_brcode_cobranca,
+    gerar_brcodes_cobrancas,
+    ler_brcode,
+)
+
+# Payload de exemplo do manual do BR Code do Banco Central.
+PAYLOAD_BCB = (
+    "00020126580014br.gov.bcb.pix0136123e4567-e12b-12d1-a456-426655440000"
+    "5204000053039865802BR5913Fulano de Tal6008BRASILIA62070503***63041D3D"
+)
+
+
+def test_crc16_valor_de_referencia():
+    assert crc16(b"123456789") == 0x29B1
+
+
+def test_gerar_brcode_estatico_igual_ao_do_bcb():
+    payload = gerar_brcode(
+        "Fulano de Tal", "BRASILIA", chave="123e4567-e12b-12d1-a456-426655440000"
+    )
+    assert payload == PAYLOAD_BCB
+
+
+def test_ler_brcode_do_bcb():
+    campos = ler_brcode(PAYLOAD_BCB)
+    assert campos["26"] == {
+        "00": "br.gov.bcb.pix",
+        "01": "123e4567-e12b-12d1-a456-426655440000",
+    }
+    assert campos["59"] == "Fulano de Tal"
+    assert campos["62"] == {"05": "***"}
+
+
+def test_ler_brcode_crc_invalido():
+    with pytest.raises(ValueError):
+        ler_brcode(PAYLOAD_BCB[:-4] + "0000")
+
+
+def test_brcode_dinamico_lote_igual_ao_individual():
+    cobrancas = [
+        {"location": f"spi-h.inter.co/pix/v2/cob/{i}", "valor": {"original": "10.5"}}
+        for i in range(3)
+    ]
+    individuais = [
+        gerar_brcode_cobranca(cobranca, "Empresa São João", "São Paulo")
+        for cobranca in cobrancas
+    ]
+    lote = list(gerar_brcodes_cobrancas(cobrancas, "Empresa São João", "São Paulo"))
+    assert lote == individuais
+    campos = ler_brcode(lote[0])
+    assert campos["01"] == "12"
+    assert campos["26"]["25"] == "spi-h.inter.co/pix/v2/cob/0"
+    assert campos["54"] == "10.50"
+    assert campos["59"] == "Empresa Sao Joao"
+
+
+def test_info_adicional_normalizada():
+    payload = gerar_brcode("Fulano", "Brasilia", chave="chave", info_adicional="Pão")
+    assert ler_brcode(payload)["26"]["02"] == "Pao"
+
+
+@pytest.mark.parametrize("txid", ["", "com espaço", "a" * 26, "tx-id"])
+def test_txid_invalido(txid):
+    with pytest.raises(ValueError):
+        gerar_brcode("Fulano", "Brasilia", chave="chave", txid=txid)
+
+
+def test_txid_valido():
+    payload = gerar_brcode("Fulano", "Brasilia", chave="chave", txid="ABC123")
+    assert ler_brcode(payload)["62"] == {"05": "ABC123"}
@@ -0,0 +1,94 @@
+import os
+import pickle
+
+import pytest
+
+from inter_api_connector import InterClient
+from inter_api_connector.cassete import GravadorCassete, ReprodutorCassete
+from inter_api_connector.error import CasseteError
+
+
+@pytest.fixture(params=["cassete.jsonl", "cassete.jsonl.gz"])
+def caminho(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+@pytest.fixture
+def rede(sessao_falsa):
+    return lambda: sessao_falsa(
+        lambda requisicao: {"url": requisicao.url, "access_token": "segredo"}
+    )
+
+
+def test_gravar_e_reproduzir(caminho, rede):
+    with GravadorCassete(caminho) as gravador:
+        sessao = gravador.envolver(rede())
+        sessao.get("https://a/cobranca/v3/cobrancas", params={"b": 2, "a": 1})
+        sessao.post("https://a/oauth/v2/token", data={"client_secret": "segredo"})
+
+    sessao = ReprodutorCassete(caminho).envolver(None)
+    resposta = sessao.get("https://b/cobranca/v3/cobrancas?a=1&b=2")
+    assert resposta.json()["url"] == "https://a/cobranca/v3/cobrancas"
+    assert resposta.json()["access_token"] == "s******"
+    sessao.post("https://b/oauth/v2/token")
+    with pytest.raises(CasseteError):
+        sessao.post("https://b/oauth/v2/token")
+
+
+def test_cliente_com_cassete_pode_ser_serializado(caminho, rede):
+    gravador = GravadorCassete(caminho)
+    gravador.envolver(rede()).get("https://a/1")
+    cliente = InterClient(client_id="id", client_secret="secret", transporte=gravador)
+
+    copia = pickle.loads(pickle.dumps(cliente))
+    copia.transporte.envolver(rede()).get("https://a/2")
+    copia.transporte.fechar()
+    gravador.fechar()
+
+    reprodutor = pickle.loads(pickle.dumps(ReprodutorCassete(caminho)))
+    sessao = reprodutor.envolver(None)
+    assert sessao.get("https://a/1").ok
+    assert sessao.get("https://a/2").ok
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requer os.fork")
+def test_gravador_herdado_por_fork(caminho, rede):
+    gravador = GravadorCassete(caminho)
+    sessao = gravador.envolver(rede())
+    sessao.get("https://a/pai")
+    pid = os.fork()
+    if pid == 0:
+        try:
+            sessao.get("https://a/filho")
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    sessao.get("https://a/pai")
+    gravador.fechar()
+
+    sessao = ReprodutorCassete(caminho).envolver(None)
+    for caminho_url in ("/pai", "/filho", "/pai"):
+        assert sessao.get("https://a" + caminho_url).ok
+
+
+def test_cassete_gz_em_um_unico_fluxo(tmp_path, rede):
+    caminhos = [str(tmp_path / "c.jsonl"), str(tmp_path / "c.jsonl.gz")]
+    for caminho in caminhos:
+        with GravadorCassete(caminho) as gravador:
+            sessao = gravador.envolver(rede())
+            for numero in range(500):
+                sessao.get(f"https://a/pix/v2/pix/{numero}")
+    texto, comprimida = (os.path.getsize(caminho) for caminho in caminhos)
+    assert comprimida * 10 < texto
+
+    sessao = ReprodutorCassete(caminhos[1]).envolver(None)
+    assert sessao.get("https://a/pix/v2/pix/499").json()["url"].endswith("/499")
+
+
+def test_cassete_gz_sem_fechar_pode_ser_reproduzida(tmp_path, rede):
+    caminho = str(tmp_path / "c.jsonl.gz")
+    gravador = GravadorCassete(caminho)
+    gravador.envolver(rede()).get("https://a/1")
+    sessao = ReprodutorCassete(caminho).envolver(None)
+    assert sessao.get("https://a/1").ok
+    gravador.fechar()
@@ -0,0 +1,129 @@
+import datetime
+import json
+
+import pytest
+import requests
+
+
+def responder_boletos(paginas=None):
+    def responder(requisicao):
+        if requisicao.metodo == "POST":
+            dados = json.loads(requisicao.kwargs["data"])
+            return {"codigoSolicitacao": dados["seuNumero"]}
+        return paginas(requisicao.kwargs["params"])
+
+    return responder
+
+
+def test_emitir_boleto_com_datetime(cliente, sessao_falsa):
+    cliente.session = sessao_falsa(responder_boletos())
+    cliente.emitir_boleto(
+        "1", "10", datetime.datetime(2024, 1, 2, 15, 30), 0, {"nome": "Fulano"}
+    )
+    dados = json.loads(cliente.session.requisicoes[0].kwargs["data"])
+    assert dados["dataVencimento"] == "2024-01-02"
+
+
+def test_emitir_boletos_em_lote_emite_todos_antes_de_retornar(cliente, sessao_falsa):
+    cliente.session = sessao_falsa(responder_boletos())
+    boletos = [
+        {
+            "seu_numero": str(i),
+            "valor_nominal": 10,
+            "data_vencimento": "2024-01-02",
+            "num_dias_agenda": 0,
+            "pagador": {},
+        }
+        for i in range(20)
+    ]
+    resultado = cliente.emitir_boletos_em_lote(boletos, max_workers=4)
+    assert len(cliente.session.requisicoes) == 20
+    assert sorted(r["codigoSolicitacao"] for _, r in resultado) == sorted(
+        b["seu_numero"] for b in boletos
+    )
+
+
+def test_iterar_colecao_boletos_v3_usa_parametros_de_paginacao(cliente, sessao_falsa):
+    def paginas(params):
+        pagina = params["paginacao.paginaAtual"]
+        return {"cobrancas": [pagina] * 2, "ultimaPagina": pagina == 2}
+
+    cliente.session = sessao_falsa(responder_boletos(paginas))
+    itens = list(cliente.iterar_colecao_boletos("2024-01-01", "2024-01-31"))
+    assert itens == [0, 0, 1, 1, 2, 2]
+    assert "paginaAtual" not in cliente.session.requisicoes[0].kwargs["params"]
+
+
+def test_iterar_colecao_boletos_para_se_a_pagina_nao_avancar(cliente, sessao_falsa):
+    # A API ignora a página pedida e sempre retorna a primeira.
+    def paginas(params):
+        return {"content": [1, 2], "last": False, "number": 0}
+
+    cliente.session = sessao_falsa(responder_boletos(paginas))
+    itens = list(
+        cliente.iterar_colecao_boletos("2024-01-01", "2024-01-31", api="cobranca")
+    )
+    assert itens == [1, 2]
+    assert len(cliente.session.requisicoes) == 2
+
+
+def test_iterar_colecao_boletos_para_se_o_conteudo_nao_avancar(cliente, sessao_falsa):
+    def paginas(params):
+        return {"cobrancas": [1, 2], "ultimaPagina": False}
+
+    cliente.session = sessao_falsa(responder_boletos(paginas))
+    itens = list(cliente.iterar_colecao_boletos("2024-01-01", "2024-01-31"))
+    assert itens == [1, 2]
+
+
+def test_acompanhar_pagamentos_em_lote_tolera_erros_de_rede(cliente, monkeypatch):
+    consultas = []
+
+    def consultar(id_lote, conta_corrente=None):
+        consultas.append(id_lote)
+        if id_lote == "B" and consultas.count("B") == 1:
+            raise requests.Timeout("timeout")
+        return {"status": "PROCESSADO", "pagamentos": [{"lote": id_lote}]}
+
+    monkeypatch.setattr(cliente, "consultar_pagamentos_em_lote", consultar)
+    resultado = list(
+        cliente.acompanhar_pagamentos_em_lote(
+            ["A", "B"], intervalo_inicial=0.01, intervalo_maximo=0.01
+        )
+    )
+    assert sorted(id_lote for id_lote, _ in resultado) == ["A", "B"]
+    assert consultas.count("B") == 2
+
+
+@pytest.mark.parametrize("status_code", [500, 502, 503, 504])
+def test_acompanhar_pagamentos_em_lote_tolera_erros_5xx(
+    cliente, sessao_falsa, status_code
+):
+    def responder(requisicao):
+        id_lote = requisicao.url.rsplit("/", 1)[1]
+        if id_lote == "B" and requisicao.numero <= 2:
+            return sessao_falsa.resposta(status_code=status_code)
+        return {"status": "PROCESSADO", "pagamentos": [{"lote": id_lote}]}
+
+    cliente.session = sessao_falsa(responder)
+    resultado = list(
+        cliente.acompanhar_pagamentos_em_lote(
+            ["B", "A"], intervalo_inicial=0.01, intervalo_maximo=0.01, max_workers=1
+        )
+    )
+    assert sorted(id_lote for id_lote, _ in resultado) == ["A", "B"]
+
+
+def test_incluir_pagamentos_em_lote_envia_todos_antes_de_retornar(cliente):
+    enviados = []
+
+    def incluir(pagamentos, meu_identificador=None, conta_corrente=None):
+        enviados.append(meu_identificador)
+        return {"idLote": meu_identificador}
+
+    cliente.incluir_lote_pagamentos = incluir
+    resultado = cliente.incluir_pagamentos_em_lote(
+        ({"tipoPagamento": "PIX"} for _ in range(250)), "folha", tamanho_lote=100
+    )
+    assert sorted(enviados) == ["folha-1", "folha-2", "folha-3"]
+    assert sorted(len(itens) for itens, _ in resultado) == [50, 100, 100]
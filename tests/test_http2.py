@@ -0,0 +1,26 @@
+import pytest
+import requests
+
+from inter_api_connector.http2 import criar_contexto_ssl
+
+
+@pytest.mark.parametrize("memfd", [True, False])
+def test_criar_contexto_ssl(monkeypatch, tmp_path, certificado, memfd):
+    if not memfd:
+        monkeypatch.delattr("os.memfd_create", raising=False)
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    criar_contexto_ssl(certificado)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_erros_do_httpx_convertidos():
+    httpx = pytest.importorskip("httpx")
+    from inter_api_connector.http2 import HTTP2Session
+
+    def falhar(requisicao):
+        raise httpx.ReadTimeout("timeout", request=requisicao)
+
+    sessao = HTTP2Session()
+    sessao.client = httpx.Client(transport=httpx.MockTransport(falhar))
+    with pytest.raises(requests.Timeout):
+        sessao.get("https://cdpj.partners.bancointer.com.br/")
@@ -0,0 +1,197 @@
+import datetime
+
+import pytest
+import requests
+
+from inter_api_connector.error import RateLimitError
+from inter_api_connector.monitoramento import (
+    FUSO_BRASILIA,
+    MonitorCobrancas,
+    _calcular_expiracao,
+)
+
+
+class ClienteFalso(object):
+    def __init__(self, respostas):
+        # txid -> função que recebe o número da consulta e retorna o status (ou
+        # levanta uma exceção).
+        self.respostas = respostas
+        self.consultas = []
+
+    def consultar_cobranca_pix_por_txid(self, tipo_cobranca, txid, conta_corrente=None):
+        self.consultas.append(txid)
+        return {"status": self.respostas[txid](self.consultas.count(txid))}
+
+
+def ativa(_):
+    return "ATIVA"
+
+
+def criar_monitor(cliente, relogio, **kwargs):
+    kwargs.setdefault("requisicoes_por_minuto", 6000)
+    kwargs.setdefault("intervalo_maximo", 8)
+    return MonitorCobrancas(cliente, intervalo_inicial=1, relogio=relogio, **kwargs)
+
+
+def test_backoff_exponencial_sem_mudanca(relogio):
+    cliente = ClienteFalso({"a": ativa})
+    monitor = criar_monitor(cliente, relogio)
+    monitor.acompanhar("a")
+
+    horarios = []
+    for _ in range(40):
+        relogio.avancar(1)
+        if monitor.executar_ciclo() == [] and cliente.consultas.count("a") > len(
+            horarios
+        ):
+            horarios.append(relogio.agora)
+    # Intervalos de 1, 2, 4, 8, 8, ... segundos.
+    intervalos = [b - a for a, b in zip(horarios, horarios[1:])]
+    assert intervalos[:4] == [2, 4, 8, 8]
+
+
+def test_mudanca_de_status_emite_evento_e_finaliza(relogio):
+    eventos = []
+    cliente = ClienteFalso({"a": lambda n: "CONCLUIDA" if n >= 2 else "ATIVA"})
+    monitor = criar_monitor(cliente, relogio, ao_mudar_status=eventos.append)
+    monitor.acompanhar("a")
+
+    for _ in range(10):
+        relogio.avancar(1)
+        monitor.executar_ciclo()
+
+    assert [(e.status_anterior, e.status_novo) for e in eventos] == [
+        ("ATIVA", "CONCLUIDA")
+    ]
+    assert len(monitor) == 0
+    assert cliente.consultas == ["a", "a"]
+
+
+def test_webhook_para_de_consultar(relogio):
+    eventos = []
+    cliente = ClienteFalso({"a": ativa})
+    monitor = criar_monitor(cliente, relogio, ao_mudar_status=eventos.append)
+    monitor.acompanhar("a")
+    monitor.processar_webhook({"pix": [{"txid": "a", "endToEndId": "E1"}]})
+
+    relogio.avancar(10)
+    assert monitor.executar_ciclo() == []
+    assert cliente.consultas == []
+    assert eventos[0].status_novo == "CONCLUIDA"
+
+
+def calendario_imediato(segundos):
+    criacao = datetime.datetime.now(datetime.timezone.utc)
+    return {"criacao": criacao.isoformat(), "expiracao": segundos}
+
+
+def test_expiracao_confirmada_pela_api(relogio):
+    horarios = []
+
+    def ativa_registrando_horario(_):
+        horarios.append(relogio.agora)
+        return "ATIVA"
+
+    cliente = ClienteFalso({"a": ativa_registrando_horario})
+    monitor = criar_monitor(cliente, relogio, intervalo_maximo=600)
+    monitor.acompanhar("a", calendario=calendario_imediato(60))
+
+    eventos = []
+    for _ in range(70):
+        relogio.avancar(1)
+        eventos += monitor.executar_ciclo()
+    assert [(e.status_anterior, e.status_novo) for e in eventos] == [
+        ("ATIVA", "EXPIRADA")
+    ]
+    # A última consulta é feita na expiração, e nenhuma depois dela.
+    assert horarios[-1] == pytest.approx(60, abs=1)
+    assert len(monitor) == 0
+
+
+def test_pagamento_perto_da_expiracao_nao_vira_expirada(relogio):
+    def paga_aos_50_segundos(_):
+        return "CONCLUIDA" if relogio.agora >= 50 else "ATIVA"
+
+    cliente = ClienteFalso({"a": paga_aos_50_segundos})
+    monitor = criar_monitor(cliente, relogio, intervalo_maximo=600)
+    monitor.acompanhar("a", calendario=calendario_imediato(60))
+
+    eventos = []
+    for _ in range(70):
+        relogio.avancar(1)
+        eventos += monitor.executar_ciclo()
+    assert [(e.status_anterior, e.status_novo) for e in eventos] == [
+        ("ATIVA", "CONCLUIDA")
+    ]
+
+
+def test_erro_na_consulta_final_tenta_novamente(relogio):
+    def falha_na_expiracao(numero):
+        if relogio.agora >= 10 and numero <= 4:
+            raise requests.ConnectionError("sem conexão")
+        return "ATIVA"
+
+    cliente = ClienteFalso({"a": falha_na_expiracao})
+    monitor = criar_monitor(cliente, relogio)
+    monitor.acompanhar("a", calendario=calendario_imediato(10))
+
+    eventos = []
+    for _ in range(30):
+        relogio.avancar(1)
+        eventos += monitor.executar_ciclo()
+    assert [e.status_novo for e in eventos] == ["EXPIRADA"]
+
+
+def test_expiracao_da_cobranca_com_vencimento_no_horario_de_brasilia():
+    expiracao = _calcular_expiracao(
+        {"dataDeVencimento": "2026-10-19", "validadeAposVencimento": 0}
+    )
+    assert expiracao == datetime.datetime(
+        2026, 10, 20, 3, 0, tzinfo=datetime.timezone.utc
+    )
+    assert expiracao.astimezone(FUSO_BRASILIA).isoformat() == (
+        "2026-10-20T00:00:00-03:00"
+    )
+
+
+def test_erro_de_rede_reagenda_sem_perder_cobrancas(relogio):
+
+    def erro_de_rede(_):
+        raise requests.ConnectionError("sem conexão")
+
+    cliente = ClienteFalso({"a": ativa, "b": erro_de_rede, "c": ativa})
+    monitor = criar_monitor(cliente, relogio)
+    for txid in "abc":
+        monitor.acompanhar(txid)
+
+    relogio.avancar(1)
+    monitor.executar_ciclo()
+    relogio.avancar(2)
+    monitor.executar_ciclo()
+
+    assert len(monitor) == 3
+    assert sorted(cliente.consultas) == ["a", "a", "b", "b", "c", "c"]
+
+
+def test_rate_limit(relogio):
+    cliente = ClienteFalso({str(i): ativa for i in range(10)})
+    monitor = criar_monitor(cliente, relogio, requisicoes_por_minuto=3)
+    for i in range(10):
+        monitor.acompanhar(str(i))
+
+    relogio.avancar(1)
+    monitor.executar_ciclo()
+    assert len(cliente.consultas) == 3
+
+
+def test_rate_limit_error_reagenda(relogio):
+
+    def limite(_):
+        raise RateLimitError("limite")
+
+    cliente = ClienteFalso({"a": limite})
+    monitor = criar_monitor(cliente, relogio)
+    monitor.acompanhar("a")
+    relogio.avancar(1)
+    assert monitor.executar_ciclo() == []
+    assert "a" in monitor
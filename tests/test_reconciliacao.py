@@ -0,0 +1,101 @@
+import pytest
+
+from inter_api_connector.reconciliacao import ConciliadorPix
+
+
+def cobranca(txid, valor="10.00"):
+    return {"txid": txid, "valor": {"original": valor}, "status": "ATIVA"}
+
+
+def pix(e2eid, txid, valor="10.00", **kwargs):
+    return {"endToEndId": e2eid, "txid": txid, "valor": valor, **kwargs}
+
+
+def test_conciliada():
+    conciliador = ConciliadorPix()
+    conciliador.adicionar_cobranca(cobranca("a"))
+    assert conciliador.status("a") == "PENDENTE"
+    assert conciliador.adicionar_pix(pix("E1", "a")) == "CONCILIADA"
+    assert conciliador.conciliadas == ["a"]
+    assert conciliador.pendentes == []
+
+
+def test_valor_divergente_e_tolerancia():
+    conciliador = ConciliadorPix()
+    conciliador.adicionar_cobranca(cobranca("a"))
+    assert conciliador.adicionar_pix(pix("E1", "a", "9.99")) == "VALOR_DIVERGENTE"
+    assert conciliador.divergencias_valor == ["a"]
+
+    conciliador = ConciliadorPix(tolerancia="0.01")
+    conciliador.adicionar_cobranca(cobranca("a"))
+    assert conciliador.adicionar_pix(pix("E1", "a", "9.99")) == "CONCILIADA"
+
+
+def test_pagamento_duplicado():
+    conciliador = ConciliadorPix()
+    conciliador.adicionar_cobranca(cobranca("a"))
+    conciliador.adicionar_pix(pix("E1", "a"))
+    assert conciliador.adicionar_pix(pix("E2", "a")) == "PAGAMENTO_DUPLICADO"
+    assert conciliador.duplicados == ["a"]
+    assert [p["endToEndId"] for p in conciliador.pix_da_cobranca("a")] == ["E1", "E2"]
+
+
+def test_pix_orfao():
+    conciliador = ConciliadorPix()
+    assert conciliador.adicionar_pix(pix("E1", None)) is None
+    assert conciliador.adicionar_pix(pix("E2", "desconhecido")) is None
+    assert sorted(p["endToEndId"] for p in conciliador.pix_orfaos) == ["E1", "E2"]
+    assert conciliador.resumo()["PIX_ORFAO"] == 2
+
+
+def test_pix_antes_da_cobranca():
+    conciliador = ConciliadorPix()
+    assert conciliador.adicionar_pix(pix("E1", "a")) is None
+    assert len(conciliador.pix_orfaos) == 1
+    assert conciliador.adicionar_cobranca(cobranca("a")) == "CONCILIADA"
+    assert conciliador.pix_orfaos == []
+
+
+def test_evento_repetido_da_consulta_e_do_webhook():
+    conciliador = ConciliadorPix()
+    conciliador.adicionar_cobranca(cobranca("a"))
+    recebido = pix("E1", "a")
+    conciliador.adicionar_pix_recebidos({"pix": [recebido]})  # webhook
+    conciliador.adicionar_pix_recebidos([dict(recebido)])  # consulta
+    assert conciliador.status("a") == "CONCILIADA"
+    assert conciliador.eventos_repetidos == 1
+    assert conciliador.resumo() == {
+        "PENDENTE": 0,
+        "CONCILIADA": 1,
+        "VALOR_DIVERGENTE": 0,
+        "PAGAMENTO_DUPLICADO": 0,
+        "PIX_ORFAO": 0,
+        "EVENTOS_REPETIDOS": 1,
+    }
+
+
+@pytest.mark.parametrize(
+    "componentes, valor_pago, status",
+    [
+        ({"juros": "1.50", "multa": "2.00"}, "103.50", "CONCILIADA"),
+        ({"desconto": "5.00", "abatimento": "1.00"}, "94.00", "CONCILIADA"),
+        ({"juros": "1.50"}, "100.00", "VALOR_DIVERGENTE"),
+        ({"original": "90.00"}, "90.00", "VALOR_DIVERGENTE"),
+    ],
+)
+def test_cobranca_com_vencimento(componentes, valor_pago, status):
+    componentes = {"original": "100.00", **componentes}
+    conciliador = ConciliadorPix()
+    conciliador.adicionar_cobranca(cobranca("a", "100.00"))
+    recebido = pix(
+        "E1",
+        "a",
+        valor_pago,
+        componentesValor={nome: {"valor": v} for nome, v in componentes.items()},
+    )
+    assert conciliador.adicionar_pix(recebido) == status
+
+
+def test_cobranca_sem_txid():
+    with pytest.raises(ValueError):
+        ConciliadorPix().adicionar_cobranca({"valor": {"original": "1.00"}})
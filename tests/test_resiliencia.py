@@ -0,0 +1,134 @@
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from inter_api_connector.error import CircuitBreakerError
+from inter_api_connector.resiliencia import (
+    CircuitBreaker,
+    TransporteResiliente,
+    familia_endpoint,
+)
+
+
+def test_familia_endpoint():
+    assert familia_endpoint("https://a/pix/v2/cob/123?x=1") == "pix/v2"
+    assert familia_endpoint("https://a/banking/v2/saldo") == "banking/v2"
+
+
+def test_circuit_breaker_abre_e_fecha(relogio):
+    circuito = CircuitBreaker(limite_falhas=3, tempo_abertura=10, relogio=relogio)
+    for _ in range(2):
+        circuito.registrar_falha()
+    assert circuito.estado == "FECHADO" and circuito.permitir()
+
+    circuito.registrar_falha()
+    assert circuito.estado == "ABERTO" and not circuito.permitir()
+
+    relogio.agora = 10
+    assert circuito.permitir()
+    assert circuito.estado == "SEMI_ABERTO"
+    # Apenas uma requisição de teste é liberada.
+    assert not circuito.permitir()
+
+    circuito.registrar_sucesso()
+    assert circuito.estado == "FECHADO" and circuito.falhas == 0
+
+
+def test_circuit_breaker_volta_a_abrir_se_o_teste_falhar(relogio):
+    circuito = CircuitBreaker(limite_falhas=1, tempo_abertura=10, relogio=relogio)
+    circuito.registrar_falha()
+    relogio.agora = 10
+    assert circuito.permitir()
+    circuito.registrar_falha()
+    assert circuito.estado == "ABERTO"
+    relogio.agora = 19
+    assert not circuito.permitir()
+
+
+def test_transporte_abre_circuito_por_familia(sessao_falsa):
+    camada = TransporteResiliente(limite_falhas=2, timeout=None)
+    sessao = camada.envolver(
+        sessao_falsa(lambda _: sessao_falsa.resposta(status_code=503))
+    )
+    for _ in range(2):
+        assert sessao.get("https://a/pix/v2/cob").status_code == 503
+    with pytest.raises(CircuitBreakerError):
+        sessao.get("https://a/pix/v2/cob")
+    assert camada.circuito("banking/v2").estado == "FECHADO"
+
+
+def test_reservar_hedge_respeita_a_fracao_maxima():
+    camada = TransporteResiliente(fracao_maxima_hedge=0.1, amostras_latencia=100)
+    permitidos = sum(camada.reservar_hedge(True) for _ in range(100))
+    assert permitidos == 10
+    assert not camada.reservar_hedge(False)
+
+
+def test_sem_hedge_se_o_circuito_deixar_de_estar_fechado(sessao_falsa):
+    evento = threading.Event()
+
+    def responder(requisicao):
+        evento.wait(1)
+
+    camada = TransporteResiliente(
+        hedge=True, atraso_hedge_inicial=0.1, fracao_maxima_hedge=1, timeout=None
+    )
+    sessao = sessao_falsa(responder)
+    circuito = camada.circuito("pix/v2")
+    # Outra requisição da família abre o circuito durante a espera pelo hedge.
+    threading.Timer(0.02, circuito.registrar_falha).start()
+    threading.Timer(0.3, evento.set).start()
+    camada.limite_falhas = circuito.limite_falhas = 1
+    assert camada.envolver(sessao).get("https://a/pix/v2/cob").ok
+    assert len(sessao.requisicoes) == 1
+
+
+def test_hedge_envia_duplicata_quando_a_resposta_demora(sessao_falsa):
+    evento = threading.Event()
+
+    def responder(requisicao):
+        if requisicao.numero == 1:
+            evento.wait(1)
+
+    camada = TransporteResiliente(
+        hedge=True, atraso_hedge_inicial=0.01, fracao_maxima_hedge=1, timeout=None
+    )
+    sessao = sessao_falsa(responder)
+    assert camada.envolver(sessao).get("https://a/pix/v2/cob").ok
+    assert len(sessao.requisicoes) == 2
+    evento.set()
+
+
+def test_hedge_nao_enfileira_a_requisicao_principal(sessao_falsa):
+    # Com mais GETs simultâneos que threads no pool do hedge, nenhum deve esperar na
+    # fila nem ser duplicado por causa dela.
+    def responder(requisicao):
+        time.sleep(0.2)
+
+    camada = TransporteResiliente(
+        hedge=True, atraso_hedge_inicial=0.5, max_workers_hedge=4, timeout=None
+    )
+    rede = sessao_falsa(responder)
+    sessao = camada.envolver(rede)
+    inicio = time.monotonic()
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        respostas = list(
+            executor.map(lambda _: sessao.get("https://a/pix/v2/cob"), range(32))
+        )
+    assert all(resposta.ok for resposta in respostas)
+    assert time.monotonic() - inicio < 0.45
+    assert len(rede.requisicoes) == 32
+
+
+def test_transporte_pode_ser_serializado():
+    camada = TransporteResiliente(limite_falhas=1, hedge=True, fracao_maxima_hedge=0.2)
+    camada.circuito("pix/v2").registrar_falha()
+    camada.registrar_latencia("pix/v2", 0.5)
+
+    copia = pickle.loads(pickle.dumps(camada))
+    assert copia.fracao_maxima_hedge == 0.2 and copia.hedge
+    assert copia.circuito("pix/v2").estado == "FECHADO"
+    assert pickle.loads(pickle.dumps(CircuitBreaker())).permitir()
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from inter_api_connector.streaming import iterar_itens_json
+
+
+def em_blocos(texto, tamanho):
+    dados = texto.encode("utf-8")
+    return [dados[i : i + tamanho] for i in range(0, len(dados), tamanho)]
+
+
+LISTAS = [
+    "[]",
+    "[1.5]",
+    "[12.25, 3]",
+    "[1e5]",
+    "[-1.5E-3, 2e+10, 0.5, -7]",
+    "[123456789, 1, 22]",
+    '["ação", "pão", {"valor": 1.25, "nome": "José"}]',
+    "[true, false, null, [1, [2.5]], {}]",
+]
+
+
+@pytest.mark.parametrize("texto", LISTAS)
+@pytest.mark.parametrize("tamanho", [1, 2, 3, 5, 7, 1000])
+def test_lista_de_primeiro_nivel(texto, tamanho):
+    assert list(iterar_itens_json(em_blocos(texto, tamanho))) == json.loads(texto)
+
+
+@pytest.mark.parametrize("tamanho", [1, 2, 3, 4, 1000])
+def test_lista_em_chave(tamanho):
+    dados = {
+        "totalPaginas": 2,
+        "saldo": 10.5,
+        "transacoes": [{"valor": "1.00"}, {"valor": 2.75}, 3e2],
+        "ultimaPagina": False,
+    }
+    outros = {}
+    itens = iterar_itens_json(
+        em_blocos(json.dumps(dados), tamanho), "transacoes", outros
+    )
+    assert list(itens) == dados["transacoes"]
+    assert outros == {"totalPaginas": 2, "saldo": 10.5}
+
+
+def test_chave_ausente():
+    assert list(iterar_itens_json([b'{"a": 1.5}'], "transacoes")) == []
+
+
+def test_blocos_de_texto():
+    assert list(iterar_itens_json(["[1.", "5, 2", "e1]"])) == [1.5, 20.0]
+
+
+def test_json_truncado():
+    with pytest.raises(ValueError):
+        list(iterar_itens_json([b"[1, 2"]))
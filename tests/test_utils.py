@@ -0,0 +1,151 @@
+import os
+import pickle
+import select
+import signal
+import threading
+import time
+
+import pytest
+
+from inter_api_connector.utils import (
+    CacheTTL,
+    executar_em_paralelo,
+    mask_sensitive_data,
+)
+
+
+def test_mask_sensitive_data():
+    assert mask_sensitive_data("segredo") == "s******"
+    assert mask_sensitive_data("a") == "a"
+    assert mask_sensitive_data(None) is None
+
+
+def test_executar_em_paralelo_devolve_excecoes():
+    def dobrar(numero):
+        if numero == 3:
+            raise ValueError("três")
+        return numero * 2
+
+    resultados = dict(executar_em_paralelo(dobrar, range(100), max_workers=4))
+    assert isinstance(resultados.pop(3), ValueError)
+    assert resultados == {n: n * 2 for n in range(100) if n != 3}
+
+
+def test_cache_ttl_expira(relogio):
+    cache = CacheTTL(10, relogio=relogio)
+    chamadas = []
+
+    def consultar():
+        chamadas.append(relogio.agora)
+        return {"disponivel": len(chamadas)}
+
+    assert cache.obter("a", consultar) == {"disponivel": 1}
+    relogio.agora = 9.9
+    assert cache.obter("a", consultar) == {"disponivel": 1}
+    relogio.agora = 10
+    assert cache.obter("a", consultar) == {"disponivel": 2}
+    assert chamadas == [0, 10]
+
+
+def test_cache_ttl_desativado():
+    cache = CacheTTL(0)
+    chamadas = []
+    for _ in range(3):
+        cache.obter("a", lambda: chamadas.append(1))
+    assert len(chamadas) == 3
+
+
+def test_cache_ttl_retorna_copias(relogio):
+    cache = CacheTTL(10, relogio=relogio)
+    primeiro = cache.obter("a", lambda: {"saldo": {"disponivel": 1}})
+    primeiro["saldo"]["disponivel"] = 100
+    segundo = cache.obter("a", lambda: None)
+    assert segundo == {"saldo": {"disponivel": 1}}
+    assert segundo is not primeiro
+
+
+def test_cache_ttl_remove_expirados_ao_gravar(relogio):
+    cache = CacheTTL(10, relogio=relogio)
+    for chave in range(5):
+        cache.obter(chave, lambda: chave)
+    relogio.agora = 20
+    cache.obter("nova", lambda: 1)
+    assert list(cache._CacheTTL__valores) == ["nova"]
+
+
+def test_cache_ttl_uma_chamada_para_acessos_simultaneos():
+    cache = CacheTTL(10)
+    chamadas = []
+    barreira = threading.Barrier(8)
+
+    def consultar():
+        chamadas.append(1)
+        time.sleep(0.05)
+        return {"saldo": 1}
+
+    def acessar():
+        barreira.wait()
+        cache.obter("a", consultar)
+
+    threads = [threading.Thread(target=acessar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(chamadas) == 1
+
+
+def test_cache_ttl_nao_cacheia_erros(relogio):
+    cache = CacheTTL(10, relogio=relogio)
+
+    def falhar():
+        raise ValueError("erro")
+
+    with pytest.raises(ValueError):
+        cache.obter("a", falhar)
+    assert cache.obter("a", lambda: 1) == 1
+
+
+def test_cache_ttl_serializa_apenas_o_ttl():
+    cache = CacheTTL(10)
+    cache.obter("a", lambda: 1)
+    copia = pickle.loads(pickle.dumps(cache))
+    assert copia.ttl == 10
+    assert copia.obter("a", lambda: 2) == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requer os.fork")
+def test_cache_ttl_apos_fork_com_consulta_em_andamento():
+    cache = CacheTTL(10)
+    iniciada = threading.Event()
+    liberar = threading.Event()
+
+    def consulta_lenta():
+        iniciada.set()
+        liberar.wait(5)
+        return "pai"
+
+    thread = threading.Thread(target=cache.obter, args=("saldo", consulta_lenta))
+    thread.start()
+    iniciada.wait(5)
+
+    leitura, escrita = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # O filho não espera pela consulta do pai, que nunca terminaria nele.
+        try:
+            os.close(leitura)
+            valor = cache.obter("saldo", lambda: "filho")
+            os.write(escrita, valor.encode())
+        finally:
+            os._exit(0)
+    os.close(escrita)
+    pronto, _, _ = select.select([leitura], [], [], 2)
+    if not pronto:
+        os.kill(pid, signal.SIGKILL)
+    liberar.set()
+    thread.join()
+    os.waitpid(pid, 0)
+    assert pronto and os.read(leitura, 10) == b"filho"
+    os.close(leitura)
+    assert cache.obter("saldo", lambda: "outro") == "pai"
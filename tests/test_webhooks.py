@@ -0,0 +1,70 @@
+import pytest
+
+from inter_api_connector.error import NotFoundError
+from inter_api_connector.webhooks import ReconciliadorWebhooks, WebhookDesejado
+
+
+class ClienteFalso(object):
+    is_autenticated = True
+
+    def __init__(self, cadastrados):
+        # (conta_corrente, api, path_parameter) -> url
+        self.cadastrados = dict(cadastrados)
+        self.chamadas = []
+
+    def obter_webhook_cadastrado(self, api, path_parameter, conta_corrente):
+        url = self.cadastrados.get((conta_corrente, api, path_parameter))
+        if url is None:
+            raise NotFoundError("não encontrado")
+        return {"webhookUrl": url}
+
+    def criar_webhook(self, api, url, path_parameter, conta_corrente):
+        self.chamadas.append(("CRIAR", conta_corrente, api, url))
+        self.cadastrados[(conta_corrente, api, path_parameter)] = url
+
+    def excluir_webhook(self, api, path_parameter, conta_corrente):
+        self.chamadas.append(("EXCLUIR", conta_corrente, api))
+        del self.cadastrados[(conta_corrente, api, path_parameter)]
+
+
+def test_reconciliar():
+    cliente = ClienteFalso(
+        {
+            ("1", "pix", "chave"): "https://a/pix",
+            ("2", "pix", "chave"): "https://antiga/pix",
+            ("3", "banking", None): "https://a/banking",
+        }
+    )
+    desejados = [
+        ("1", "pix", "https://a/pix", "chave"),
+        ("2", "pix", "https://a/pix", "chave"),
+        ("3", "banking", None),
+        ("4", "cobranca", "https://a/boletos"),
+    ]
+    reconciliador = ReconciliadorWebhooks(cliente)
+
+    plano = reconciliador.planejar(desejados)
+    assert [acao.acao for acao in plano] == ["MANTER", "CRIAR", "EXCLUIR", "CRIAR"]
+    assert cliente.chamadas == []
+
+    resultado = reconciliador.aplicar(plano)
+    assert all(acao.erro is None for acao in resultado)
+    assert [acao.acao for acao in reconciliador.planejar(desejados)] == ["MANTER"] * 4
+
+
+def test_planejar_remove_duplicados():
+    cliente = ClienteFalso({})
+    webhook = WebhookDesejado("1", "pix", "https://a/pix", "chave")
+    plano = ReconciliadorWebhooks(cliente).planejar([webhook, tuple(webhook)])
+    assert [acao.webhook for acao in plano] == [webhook]
+
+
+def test_planejar_rejeita_conflitos():
+    cliente = ClienteFalso({})
+    with pytest.raises(ValueError):
+        ReconciliadorWebhooks(cliente).planejar(
+            [
+                ("1", "pix", "https://a/pix", "chave"),
+                ("1", "pix", "https://b/pix", "chave"),
+            ]
+        )